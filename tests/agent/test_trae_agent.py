@@ -1,10 +1,17 @@
 # Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
-from trae_agent.agent.agent_basics import AgentError
+from trae_agent.agent.agent_basics import (
+    AgentError,
+    AgentExecution,
+    AgentStep,
+    AgentStepState,
+)
 from trae_agent.agent.trae_agent import TraeAgent
 from trae_agent.utils.config import Config
 from trae_agent.utils.legacy_config import LegacyConfig
@@ -113,6 +120,39 @@ class TestTraeAgentExtended(unittest.TestCase):
         self.assertIn("sequentialthinking", tool_names)
         self.assertIn("task_done", tool_names)
 
+    def test_llm_steps_of_concurrent_agents_overlap(self):
+        """Test that agents sharing an event loop, as in a batch run, wait on the LLM together."""
+        assert self.config.trae_agent
+        other_agent = TraeAgent(self.config.trae_agent)
+        # Both requests must be in flight at once for either to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def chat(*args, **kwargs):
+            _ = barrier.wait()
+            return LLMResponse(content="working on it")
+
+        async def achat(*args, **kwargs):
+            return await asyncio.to_thread(chat, *args, **kwargs)
+
+        for agent in (self.agent, other_agent):
+            agent.llm_client.chat = chat
+            agent.llm_client.achat = achat
+
+        async def run_steps():
+            return await asyncio.gather(
+                *(
+                    agent._run_llm_step(
+                        AgentStep(step_number=1, state=AgentStepState.THINKING),
+                        [],
+                        AgentExecution(task="test", steps=[]),
+                    )
+                    for agent in (self.agent, other_agent)
+                )
+            )
+
+        for messages in asyncio.run(run_steps()):
+            self.assertEqual(messages[0].content, "It seems that you have not completed the task.")
+
     def test_protected_attributes_access_restrictions(self):
         """Test that protected attributes cannot be accessed directly from outside the class."""
 
@@ -1,9 +1,9 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from click.testing import CliRunner
 
-from trae_agent.cli import cli
+from trae_agent.cli import _select_agent_type, cli
 
 
 class TestCli(unittest.TestCase):
@@ -31,7 +31,7 @@ class TestCli(unittest.TestCase):
         mock_agent = MagicMock()
         mock_agent_class.return_value = mock_agent
         mock_console = MagicMock()
-        # Add the methods that hasattr checks for
+        # Add the Rich-only console methods
         mock_console.set_initial_task = MagicMock()
         mock_console.set_agent_context = MagicMock()
         mock_create_console.return_value = mock_console
@@ -67,7 +67,7 @@ class TestCli(unittest.TestCase):
         mock_agent = MagicMock()
         mock_agent_class.return_value = mock_agent
         mock_console = MagicMock()
-        # Add the methods that hasattr checks for
+        # Add the Rich-only console methods
         mock_console.set_initial_task = MagicMock()
         mock_console.set_agent_context = MagicMock()
         mock_create_console.return_value = mock_console
@@ -158,7 +158,7 @@ class TestCli(unittest.TestCase):
         mock_agent = MagicMock()
         mock_agent_class.return_value = mock_agent
         mock_console = MagicMock()
-        # Add the methods that hasattr checks for
+        # Add the Rich-only console methods
         mock_console.set_initial_task = MagicMock()
         mock_console.set_agent_context = MagicMock()
         mock_create_console.return_value = mock_console
@@ -176,6 +176,59 @@ class TestCli(unittest.TestCase):
             args, _ = mock_agent.run.call_args
             self.assertEqual(args[0], "task.txt")
 
+    @patch("trae_agent.cli.resolve_config_file", return_value="test_config.yaml")
+    @patch("trae_agent.cli.Agent")
+    @patch("trae_agent.cli.Config.create")
+    def test_batch_runs_every_task(
+        self,
+        mock_config_create,
+        mock_agent_class,
+        mock_resolve_config_file,
+    ):
+        """Test that the batch command runs one agent per task line."""
+        mock_config = MagicMock()
+        mock_config_create.return_value.resolve_config_values.return_value = mock_config
+        mock_agent = MagicMock()
+        mock_agent.run = AsyncMock(return_value=MagicMock(success=True))
+        mock_agent.trajectory_file = "trajectory.json"
+        mock_agent_class.return_value = mock_agent
+
+        with self.runner.isolated_filesystem():
+            with open("tasks.jsonl", "w") as f:
+                f.write('{"task": "first task", "working_dir": "/tmp"}\n')
+                f.write("\n")
+                f.write('{"task": "second task", "working_dir": "/tmp", "must_patch": true}\n')
+
+            result = self.runner.invoke(
+                cli, ["batch", "--tasks-file", "tasks.jsonl", "--concurrency", "2"]
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+
+        mock_config_create.assert_called_once()
+        self.assertEqual(mock_agent_class.call_count, 2)
+        tasks = sorted(call.args[0] for call in mock_agent.run.call_args_list)
+        self.assertEqual(tasks, ["first task", "second task"])
+
+    @patch("trae_agent.cli.resolve_config_file", return_value="test_config.yaml")
+    def test_batch_with_relative_working_dir(self, mock_resolve_config_file):
+        """Test for a clear error when a batch task has a relative working_dir."""
+        with self.runner.isolated_filesystem():
+            with open("tasks.jsonl", "w") as f:
+                f.write('{"task": "some task", "working_dir": "relative/dir"}\n')
+
+            result = self.runner.invoke(cli, ["batch", "--tasks-file", "tasks.jsonl"])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("must be an absolute path", result.output)
+
+    @patch("trae_agent.cli.console")
+    def test_unknown_agent_type_lists_valid_values(self, mock_console):
+        """Test that an unknown agent type is reported as such, not as a missing one."""
+        with self.assertRaises(SystemExit):
+            _ = _select_agent_type("bogus_agent")
+        message = mock_console.print.call_args.args[0]
+        self.assertIn("unknown agent_type 'bogus_agent'", message)
+        self.assertIn("trae_agent", message)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,16 @@
 # Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 
-from trae_agent.utils.config import Config, ModelConfig, ModelProvider
+import yaml
+
+from trae_agent.utils.config import Config, ConfigError, ModelConfig, ModelProvider
 from trae_agent.utils.legacy_config import LegacyConfig
 from trae_agent.utils.llm_clients.anthropic_client import AnthropicClient
 from trae_agent.utils.llm_clients.openai_client import OpenAIClient
@@ -232,5 +238,139 @@ class TestLakeviewConfig(unittest.TestCase):
         self.assertEqual(config.trae_agent.mcp_servers_config, {})
 
 
+_YAML_CONFIG = """
+agents:
+  trae_agent:
+    enable_lakeview: false
+    model: default_model
+    max_steps: {max_steps}
+model_providers:
+  anthropic:
+    api_key: test-api-key
+    provider: anthropic
+models:
+  default_model:
+    model_provider: anthropic
+    model: claude-sonnet-4-20250514
+    max_tokens: 4096
+    temperature: 0.5
+    top_p: 1
+    top_k: 0
+    parallel_tool_calls: false
+    max_retries: 10
+  lakeview_model:
+    model_provider: anthropic
+    model: claude-3-5-haiku-20241022
+    max_tokens: 4096
+    temperature: 0.5
+    top_p: 1
+    top_k: 0
+    parallel_tool_calls: false
+    max_retries: 10
+lakeview:
+  model: lakeview_model
+"""
+
+
+class TestYamlConfigCache(unittest.TestCase):
+    def test_config_file_change_is_picked_up(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "trae_config.yaml")
+            with open(config_file, "w") as f:
+                _ = f.write(_YAML_CONFIG.format(max_steps=20))
+            config = Config.create(config_file=config_file)
+            assert config.trae_agent
+            self.assertEqual(config.trae_agent.max_steps, 20)
+
+            with open(config_file, "w") as f:
+                _ = f.write(_YAML_CONFIG.format(max_steps=200))
+            config = Config.create(config_file=config_file)
+            assert config.trae_agent
+            self.assertEqual(config.trae_agent.max_steps, 200)
+
+    def test_configs_from_same_string_are_independent(self):
+        config_string = _YAML_CONFIG.format(max_steps=20)
+        first = Config.create(config_string=config_string)
+        assert first.trae_agent
+        first.trae_agent.allow_mcp_servers.append("server")
+        first.trae_agent.model.max_tokens = 1
+
+        second = Config.create(config_string=config_string)
+        assert second.trae_agent
+        self.assertEqual(second.trae_agent.allow_mcp_servers, [])
+        self.assertEqual(second.trae_agent.model.max_tokens, 4096)
+
+
+class TestPrecompiledConfig(unittest.TestCase):
+    def test_precompiled_python_config(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "trae_config_data.py")
+            with open(config_file, "w") as f:
+                _ = f.write(f"CONFIG = {yaml.safe_load(_YAML_CONFIG.format(max_steps=30))!r}\n")
+            config = Config.create(config_file=config_file)
+            assert config.trae_agent
+            self.assertEqual(config.trae_agent.max_steps, 30)
+            self.assertEqual(config.trae_agent.model.model, "claude-sonnet-4-20250514")
+
+    def test_precompiled_python_config_skips_yaml_import(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "trae_config_data.py")
+            with open(config_file, "w") as f:
+                _ = f.write(f"CONFIG = {yaml.safe_load(_YAML_CONFIG.format(max_steps=30))!r}\n")
+            # A fresh interpreter, as this one has imported PyYAML already
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys\n"
+                    "from trae_agent.utils.config import Config\n"
+                    f"Config.create(config_file={config_file!r})\n"
+                    "print('yaml' in sys.modules)",
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+class TestModelProviders(unittest.TestCase):
+    def test_resolved_provider_is_shared_by_models(self):
+        config = Config.create(config_string=_YAML_CONFIG.format(max_steps=20))
+        with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "env-api-key"}):
+            _ = config.resolve_config_values()
+        assert config.trae_agent and config.lakeview and config.model_providers
+        self.assertEqual(config.trae_agent.model.model_provider.api_key, "env-api-key")
+        self.assertEqual(config.lakeview.model.model_provider.api_key, "env-api-key")
+        self.assertEqual(config.model_providers["anthropic"].api_key, "env-api-key")
+
+    def test_unhashable_provider_values_are_accepted(self):
+        config_string = _YAML_CONFIG.format(max_steps=20).replace(
+            "provider: anthropic\nmodels:", "provider: anthropic\n    base_url: [a, b]\nmodels:"
+        )
+        config = Config.create(config_string=config_string)
+        assert config.model_providers
+        self.assertEqual(config.model_providers["anthropic"].base_url, ["a", "b"])
+
+
+class TestConfigSections(unittest.TestCase):
+    def test_missing_sections_are_reported_together(self):
+        with self.assertRaises(ConfigError) as context:
+            _ = Config.create(config_string="lakeview:\n  model: default_model\n")
+        message = str(context.exception)
+        self.assertIn("No model providers provided", message)
+        self.assertIn("No models provided", message)
+        self.assertIn("No agent configs provided", message)
+
+    def test_enabled_lakeview_requires_lakeview_section(self):
+        config_string = _YAML_CONFIG.format(max_steps=20).replace(
+            "enable_lakeview: false", "enable_lakeview: true"
+        )
+        config_string = config_string[: config_string.index("lakeview:\n")]
+        with self.assertRaises(ConfigError) as context:
+            _ = Config.create(config_string=config_string)
+        self.assertIn("Lakeview is enabled", str(context.exception))
+
+
 if __name__ == "__main__":
     unittest.main()
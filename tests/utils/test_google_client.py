@@ -8,14 +8,19 @@ WARNING: These tests should not be run in a GitHub Actions workflow
 because they require an API key.
 """
 
+import asyncio
+import json
 import os
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from google.genai import types
 
 from trae_agent.tools.base import Tool, ToolCall, ToolResult
 from trae_agent.utils.config import ModelConfig, ModelProvider
 from trae_agent.utils.llm_clients.google_client import GoogleClient
 from trae_agent.utils.llm_clients.llm_basics import LLMMessage
+from trae_agent.utils.llm_clients.llm_client import LLMClient
 
 TEST_MODEL = "gemini-2.5-flash"
 
@@ -193,6 +198,367 @@ class TestGoogleClient(unittest.TestCase):
         self.assertEqual(tool_call.arguments, {"location": "Boston"})
         self.assertEqual(response.finish_reason, "TOOL_CALL")
 
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_google_achat_many(self, mock_genai_client):
+        """
+        Test that achat_many sends every conversation through the async client.
+        """
+
+        async def generate_content(model, contents, config):
+            response = MagicMock()
+            response.candidates = [MagicMock()]
+            response.candidates[0].content.parts = [
+                MagicMock(text=f"Echo: {contents[-1].parts[0].text}")
+            ]
+            response.candidates[0].finish_reason.name = "STOP"
+            response.usage_metadata = None
+            return response
+
+        mock_genai_client.return_value.aio.models.generate_content = generate_content
+
+        model_config = ModelConfig(
+            model=TEST_MODEL,
+            model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+            max_tokens=1000,
+            temperature=0.8,
+            top_p=1.0,
+            top_k=1,
+            parallel_tool_calls=False,
+            max_retries=1,
+        )
+        llm_client = LLMClient(model_config)
+        llm_client.set_chat_history(
+            [LLMMessage("system", "sys"), LLMMessage("user", "q"), LLMMessage("assistant", "a")]
+        )
+        google_client = llm_client.client
+        assert isinstance(google_client, GoogleClient)
+        history = list(google_client.message_history)
+
+        responses = asyncio.run(
+            llm_client.achat_many(
+                [[LLMMessage("user", "first")], [LLMMessage("user", "second")]], model_config
+            )
+        )
+
+        self.assertEqual(
+            [response.content for response in responses], ["Echo: first", "Echo: second"]
+        )
+        mock_genai_client.return_value.models.generate_content.assert_not_called()
+        # The one-shot requests leave the ongoing conversation alone
+        self.assertEqual(google_client.message_history, history)
+        self.assertEqual(google_client.system_instruction, "sys")
+
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_google_chat_reuses_tool_cache(self, mock_genai_client):
+        """
+        Test that the tool declarations are cached once and referenced by name afterwards.
+        """
+        client = mock_genai_client.return_value
+        client.caches.create.return_value.name = "cachedContents/tools"
+        mock_response = MagicMock()
+        mock_response.candidates = [MagicMock()]
+        mock_response.candidates[0].content.parts = [MagicMock(text="Hello!")]
+        mock_response.candidates[0].finish_reason.name = "STOP"
+        client.models.generate_content.return_value = mock_response
+
+        mock_tool = MagicMock(spec=Tool)
+        mock_tool.get_name.return_value = "get_weather"
+        mock_tool.get_description.return_value = "Gets the weather for a location."
+        mock_tool.get_input_schema.return_value = {
+            "type": "object",
+            "properties": {"location": {"type": "string"}},
+        }
+
+        model_config = ModelConfig(
+            model=TEST_MODEL,
+            model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+            max_tokens=1000,
+            temperature=0.8,
+            top_p=1.0,
+            top_k=1,
+            parallel_tool_calls=False,
+            max_retries=1,
+        )
+        google_client = GoogleClient(model_config)
+        schema_reads: list[int] = []
+        for question in ("What is the weather?", "And tomorrow?"):
+            _ = google_client.chat(
+                messages=[LLMMessage("system", "Be brief."), LLMMessage("user", question)],
+                model_config=model_config,
+                tools=[mock_tool],
+            )
+            schema_reads.append(mock_tool.get_input_schema.call_count)
+
+        client.caches.create.assert_called_once()
+        # Schemas built on the first turn are reused for the same tool
+        self.assertEqual(schema_reads[0], schema_reads[1])
+        generation_config = client.models.generate_content.call_args.kwargs["config"]
+        self.assertEqual(generation_config.cached_content, "cachedContents/tools")
+        self.assertIsNone(generation_config.tools)
+        self.assertIsNone(generation_config.system_instruction)
+
+        google_client.close()
+        client.caches.delete.assert_called_once_with(name="cachedContents/tools")
+
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_google_achat_shares_tool_cache(self, mock_genai_client):
+        """
+        Test that concurrent clients create one tool cache off the event loop and the last to
+        close deletes it.
+        """
+        client = mock_genai_client.return_value
+        created = asyncio.Event()
+
+        async def create_cache(**kwargs):
+            await created.wait()
+            return types.CachedContent(name="cachedContents/shared")
+
+        client.aio.caches.create = AsyncMock(side_effect=create_cache)
+        client.aio.caches.delete = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.candidates = [MagicMock()]
+        mock_response.candidates[0].content.parts = [MagicMock(text="Hello!")]
+        mock_response.candidates[0].finish_reason.name = "STOP"
+        client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+
+        mock_tool = MagicMock(spec=Tool)
+        mock_tool.get_name.return_value = "get_weather"
+        mock_tool.get_description.return_value = "Gets the weather for a location."
+        mock_tool.get_input_schema.return_value = {"type": "object", "properties": {}}
+
+        model_config = ModelConfig(
+            model=TEST_MODEL,
+            model_provider=ModelProvider(api_key="shared-api-key", provider="google"),
+            max_tokens=1000,
+            temperature=0.8,
+            top_p=1.0,
+            top_k=1,
+            parallel_tool_calls=False,
+            max_retries=1,
+        )
+        google_clients = [GoogleClient(model_config) for _ in range(3)]
+
+        async def run():
+            chats = [
+                asyncio.create_task(
+                    google_client.achat(
+                        [LLMMessage("system", "Be brief."), LLMMessage("user", "Hi")],
+                        model_config,
+                        tools=[mock_tool],
+                    )
+                )
+                for google_client in google_clients
+            ]
+            # The event loop stays free while the cache is being created
+            await asyncio.sleep(0)
+            created.set()
+            _ = await asyncio.gather(*chats)
+            for google_client in google_clients[:-1]:
+                await google_client.aclose()
+            client.aio.caches.delete.assert_not_called()
+            await google_clients[-1].aclose()
+
+        asyncio.run(run())
+
+        client.caches.create.assert_not_called()
+        client.aio.caches.create.assert_called_once()
+        client.aio.caches.delete.assert_called_once_with(name="cachedContents/shared")
+        for call in client.aio.models.generate_content.call_args_list:
+            self.assertEqual(call.kwargs["config"].cached_content, "cachedContents/shared")
+
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_google_chat_streams_tokens(self, mock_genai_client):
+        """
+        Test that streamed text reaches on_token as it arrives and the chunks form one response.
+        """
+        chunks = [
+            types.GenerateContentResponse(
+                candidates=[
+                    types.Candidate(
+                        content=types.Content(role="model", parts=[types.Part(text=text)])
+                    )
+                ]
+            )
+            for text in ("Let me ", "check.")
+        ]
+        chunks.append(
+            types.GenerateContentResponse(
+                candidates=[
+                    types.Candidate(
+                        content=types.Content(
+                            role="model",
+                            parts=[
+                                types.Part(
+                                    function_call=types.FunctionCall(
+                                        name="get_weather", args={"location": "Boston"}
+                                    )
+                                )
+                            ],
+                        ),
+                        finish_reason=types.FinishReason.STOP,
+                    )
+                ],
+                usage_metadata=types.GenerateContentResponseUsageMetadata(
+                    prompt_token_count=10, candidates_token_count=5
+                ),
+            )
+        )
+        mock_genai_client.return_value.models.generate_content_stream.return_value = iter(chunks)
+
+        model_config = ModelConfig(
+            model=TEST_MODEL,
+            model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+            max_tokens=1000,
+            temperature=0.8,
+            top_p=1.0,
+            top_k=1,
+            parallel_tool_calls=False,
+            max_retries=1,
+        )
+        tokens: list[str] = []
+        response = GoogleClient(model_config).chat(
+            [LLMMessage("user", "What is the weather in Boston?")],
+            model_config,
+            on_token=tokens.append,
+        )
+
+        mock_genai_client.return_value.models.generate_content.assert_not_called()
+        self.assertEqual(tokens, ["Let me ", "check."])
+        self.assertEqual(response.content, "Let me check.")
+        self.assertEqual(response.finish_reason, "STOP")
+        assert response.tool_calls is not None and response.usage is not None
+        self.assertEqual(response.tool_calls[0].arguments, {"location": "Boston"})
+        self.assertEqual(response.usage.output_tokens, 5)
+
+    @patch("trae_agent.utils.llm_clients.retry_utils.time.sleep")
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_google_stream_is_not_replayed(self, mock_genai_client, mock_sleep):
+        """
+        Test that a stream failing after text was passed on is not retried from the start.
+        """
+        chunk = types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(content=types.Content(role="model", parts=[types.Part(text="Hi")]))
+            ]
+        )
+
+        def broken_stream(**_):
+            yield chunk
+            raise ConnectionError("stream reset")
+
+        stream = mock_genai_client.return_value.models.generate_content_stream
+        stream.side_effect = broken_stream
+
+        model_config = ModelConfig(
+            model=TEST_MODEL,
+            model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+            max_tokens=1000,
+            temperature=0.8,
+            top_p=1.0,
+            top_k=1,
+            parallel_tool_calls=False,
+            max_retries=3,
+        )
+        tokens: list[str] = []
+        with self.assertRaises(ConnectionError):
+            GoogleClient(model_config).chat(
+                [LLMMessage("user", "Hello")], model_config, on_token=tokens.append
+            )
+
+        self.assertEqual(tokens, ["Hi"])
+        self.assertEqual(stream.call_count, 1)
+
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_google_chat_history_is_committed_once(self, mock_genai_client):
+        """
+        Test that a failed call leaves the history alone and a resent turn is added only once.
+        """
+        response = types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=[types.Part(text="Hello!")]),
+                    finish_reason=types.FinishReason.STOP,
+                )
+            ]
+        )
+        mock_genai_client.return_value.models.generate_content.side_effect = [
+            ValueError("Bad response"),
+            response,
+            response,
+        ]
+        model_config = ModelConfig(
+            model=TEST_MODEL,
+            model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+            max_tokens=1000,
+            temperature=0.8,
+            top_p=1.0,
+            top_k=1,
+            parallel_tool_calls=False,
+            max_retries=0,
+        )
+        google_client = GoogleClient(model_config)
+        messages = [LLMMessage("user", "Hi")]
+
+        with self.assertRaises(ValueError):
+            _ = google_client.chat(messages, model_config)
+        self.assertEqual(google_client.message_history, [])
+
+        for _ in range(2):
+            _ = google_client.chat(messages, model_config)
+        self.assertEqual(
+            [content.role for content in google_client.message_history], ["user", "model", "model"]
+        )
+
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_google_batch_chat(self, mock_genai_client):
+        """
+        Test that batch_chat submits one JSONL line per conversation and maps results back by key.
+        """
+        client = mock_genai_client.return_value
+        client.files.upload.return_value.name = "files/requests"
+        client.batches.create.return_value = MagicMock(
+            state=types.JobState.JOB_STATE_SUCCEEDED, dest=MagicMock(file_name="files/results")
+        )
+        client.files.download.return_value = b"\n".join(
+            json.dumps(
+                {
+                    "key": key,
+                    "response": {
+                        "candidates": [
+                            {
+                                "content": {"role": "model", "parts": [{"text": f"Answer {key}"}]},
+                                "finishReason": "STOP",
+                            }
+                        ]
+                    },
+                }
+            ).encode()
+            for key in ("1", "0")
+        )
+
+        model_config = ModelConfig(
+            model=TEST_MODEL,
+            model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+            max_tokens=1000,
+            temperature=0.8,
+            top_p=1.0,
+            top_k=1,
+            parallel_tool_calls=False,
+            max_retries=1,
+        )
+        google_client = GoogleClient(model_config)
+        responses = google_client.batch_chat(
+            [[LLMMessage("user", "First question")], [LLMMessage("user", "Second question")]],
+            model_config,
+        )
+
+        self.assertEqual([response.content for response in responses], ["Answer 0", "Answer 1"])
+        self.assertEqual(responses[0].finish_reason, "STOP")
+        uploaded = client.files.upload.call_args.kwargs["file"].getvalue().decode()
+        self.assertEqual(len(uploaded.splitlines()), 2)
+        client.batches.create.assert_called_once_with(model=TEST_MODEL, src="files/requests")
+        self.assertEqual(google_client.message_history, [])
+
     def test_parse_messages(self):
         """Test the parse_messages method with various message types."""
         google_client = GoogleClient(
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from trae_agent.utils.llm_clients._limiter import AsyncTokenBucket, retry_after_seconds
+
+
+class _RateLimitError(Exception):
+    pass
+
+
+def _rate_limit_error(headers: dict[str, str]) -> _RateLimitError:
+    error = _RateLimitError("rate limited")
+    error.status_code = 429  # pyright: ignore[reportAttributeAccessIssue]
+    error.response = MagicMock(headers=headers)  # pyright: ignore[reportAttributeAccessIssue]
+    return error
+
+
+class TestRetryAfter(unittest.TestCase):
+    def test_reads_the_longest_reset_header(self):
+        error = _rate_limit_error({"retry-after": "2", "x-ratelimit-reset-tokens": "1m30s"})
+        self.assertEqual(retry_after_seconds(error), 90.0)
+
+    def test_ignores_errors_that_are_not_rate_limits(self):
+        error = _rate_limit_error({"retry-after": "2"})
+        error.status_code = 500  # pyright: ignore[reportAttributeAccessIssue]
+        self.assertIsNone(retry_after_seconds(error))
+
+
+class TestAsyncTokenBucket(unittest.TestCase):
+    def test_requests_beyond_the_quota_wait_for_a_refill(self):
+        # 600 requests per minute refill one request every 0.1 seconds
+        bucket = AsyncTokenBucket(rpm=600)
+        bucket._requests = 1.0
+
+        async def make_requests():
+            for _ in range(3):
+                async with bucket.acquire(0):
+                    pass
+
+        start = time.monotonic()
+        asyncio.run(make_requests())
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+    def test_rate_limit_error_blocks_the_bucket(self):
+        bucket = AsyncTokenBucket(tpm=1000)
+
+        async def rejected_request():
+            async with bucket.acquire(10):
+                raise _rate_limit_error({"retry-after": "30"})
+
+        with self.assertRaises(_RateLimitError):
+            asyncio.run(rejected_request())
+        self.assertGreater(bucket._reserve(10), 29.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from mcp.types import ServerNotification, ToolListChangedNotification
+
 from trae_agent.utils.mcp_client import MCPClient, MCPServerConfig, MCPServerStatus
 
 
@@ -70,7 +72,7 @@ class TestMCPClient(unittest.IsolatedAsyncioTestCase):
     async def test_call_tool(self):
         mock_session = AsyncMock()
         mock_session.call_tool = AsyncMock(return_value={"result": "ok"})
-        self.client.session = mock_session
+        self.client.sessions["test_server"] = mock_session
 
         result = await self.client.call_tool("tool_name", {"arg1": "val"})
         self.assertEqual(result, {"result": "ok"})
@@ -78,11 +80,101 @@ class TestMCPClient(unittest.IsolatedAsyncioTestCase):
     async def test_list_tools(self):
         mock_session = AsyncMock()
         mock_session.list_tools = AsyncMock(return_value=["tool1", "tool2"])
-        self.client.session = mock_session
+        self.client.sessions["test_server"] = mock_session
 
         result = await self.client.list_tools()
         self.assertEqual(result, ["tool1", "tool2"])
 
+    async def test_list_tools_is_cached_until_the_server_reports_a_change(self):
+        mock_session = AsyncMock()
+        mock_session.list_tools = AsyncMock(return_value=["tool1"])
+        self.client.sessions["test_server"] = mock_session
+
+        _ = await self.client.list_tools("test_server")
+        _ = await self.client.list_tools("test_server")
+        mock_session.list_tools.assert_awaited_once()
+
+        session = self.client._create_session("test_server", MagicMock(), MagicMock())
+        await session._message_handler(
+            ServerNotification(
+                ToolListChangedNotification(method="notifications/tools/list_changed")
+            )
+        )
+        _ = await self.client.list_tools("test_server")
+        self.assertEqual(mock_session.list_tools.await_count, 2)
+
+    async def test_call_tool_uses_named_session(self):
+        sessions = {name: AsyncMock() for name in ("first", "second")}
+        for name, session in sessions.items():
+            session.call_tool = AsyncMock(return_value={"server": name})
+        self.client.sessions.update(sessions)
+
+        result = await self.client.call_tool("tool_name", {}, "second")
+        self.assertEqual(result, {"server": "second"})
+        with self.assertRaises(ValueError):
+            await self.client.call_tool("tool_name", {})
+
+    @patch("trae_agent.utils.mcp_client.stdio_client")
+    @patch("trae_agent.utils.mcp_client.ClientSession")
+    async def test_connect_all(self, mock_client_session, mock_stdio_client):
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = mock_client_session.return_value.__aenter__.return_value
+        mock_session.initialize = AsyncMock()
+        mock_session.list_tools = AsyncMock(return_value=MagicMock(tools=[MagicMock()]))
+        configs = {
+            "first": MCPServerConfig(command="echo", args=[]),
+            "second": MCPServerConfig(command="echo", args=[]),
+            "invalid": MCPServerConfig(),
+        }
+
+        mcp_tools = []
+        failed = await self.client.connect_all(configs, mcp_tools, model_provider=None)
+
+        self.assertEqual(failed, ["invalid"])
+        self.assertEqual([tool.mcp_server_name for tool in mcp_tools], ["first", "second"])
+        self.assertEqual(self.client.get_mcp_server_status("second"), MCPServerStatus.CONNECTED)
+        self.assertEqual(self.client.get_mcp_server_status("invalid"), MCPServerStatus.DISCONNECTED)
+
+    @patch("trae_agent.utils.mcp_client.stdio_client")
+    @patch("trae_agent.utils.mcp_client.ClientSession")
+    async def test_connect_all_closes_failed_server(self, mock_client_session, mock_stdio_client):
+        transport = mock_stdio_client.return_value
+        transport.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = mock_client_session.return_value.__aenter__.return_value
+        mock_session.initialize = AsyncMock()
+        mock_session.list_tools = AsyncMock(side_effect=RuntimeError("no tools"))
+
+        mcp_tools = []
+        failed = await self.client.connect_all(
+            {"broken": MCPServerConfig(command="echo", args=[])}, mcp_tools, model_provider=None
+        )
+
+        self.assertEqual(failed, ["broken"])
+        # The server's session and process are shut down without waiting for cleanup
+        transport.__aexit__.assert_awaited_once()
+        self.assertNotIn("broken", self.client.sessions)
+        self.assertEqual(self.client.get_mcp_server_status("broken"), MCPServerStatus.DISCONNECTED)
+
+    @patch("trae_agent.utils.mcp_client.stdio_client")
+    @patch("trae_agent.utils.mcp_client.ClientSession")
+    async def test_cleanup_disconnects_every_server(self, mock_client_session, mock_stdio_client):
+        transport = mock_stdio_client.return_value
+        transport.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = mock_client_session.return_value.__aenter__.return_value
+        mock_session.initialize = AsyncMock()
+        mock_session.list_tools = AsyncMock(return_value=MagicMock(tools=[]))
+        configs = {name: MCPServerConfig(command="echo", args=[]) for name in ("first", "second")}
+
+        _ = await self.client.connect_all(configs, [], model_provider=None)
+        transport.__aexit__.assert_not_awaited()
+
+        await self.client.cleanup()
+        self.assertEqual(transport.__aexit__.await_count, 2)
+        self.assertEqual(
+            self.client.mcp_servers_status,
+            dict.fromkeys(configs, MCPServerStatus.DISCONNECTED),
+        )
+
     async def test_cleanup(self):
         self.client.update_mcp_server_status("test_server", MCPServerStatus.CONNECTED)
         self.client.exit_stack.aclose = AsyncMock()
@@ -0,0 +1,104 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from google.genai import types
+
+from trae_agent.utils.config import ModelConfig, ModelProvider
+from trae_agent.utils.llm_clients._response_cache import (
+    ResponseCache,
+    is_cacheable,
+    response_cache_key,
+)
+from trae_agent.utils.llm_clients.google_client import GoogleClient
+from trae_agent.utils.llm_clients.llm_basics import LLMMessage
+
+
+def _model_config(temperature: float = 0.0, cache_responses: bool = True) -> ModelConfig:
+    return ModelConfig(
+        model="gemini-2.5-flash",
+        model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+        max_tokens=1000,
+        temperature=temperature,
+        top_p=1.0,
+        top_k=1,
+        parallel_tool_calls=False,
+        max_retries=0,
+        cache_responses=cache_responses,
+    )
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "responses.sqlite3"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stored_response_is_returned(self):
+        cache = ResponseCache(self.path)
+        cache.set("key", {"text": "Hello"})
+        self.assertEqual(cache.get("key"), {"text": "Hello"})
+        self.assertIsNone(cache.get("other"))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ResponseCache(self.path, size_limit=50)
+        cache.set("first", {"text": "a" * 10})
+        cache.set("second", {"text": "b" * 10})
+        _ = cache.get("first")
+        cache.set("third", {"text": "c" * 10})
+        self.assertIsNotNone(cache.get("first"))
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNotNone(cache.get("third"))
+
+    def test_only_deterministic_requests_are_cacheable(self):
+        self.assertTrue(is_cacheable(_model_config()))
+        self.assertFalse(is_cacheable(_model_config(temperature=0.5)))
+        self.assertFalse(is_cacheable(_model_config(cache_responses=False)))
+
+    def test_key_depends_on_request(self):
+        model_config = _model_config()
+        self.assertEqual(
+            response_cache_key(model_config, {"messages": ["a"], "tools": []}),
+            response_cache_key(model_config, {"tools": [], "messages": ["a"]}),
+        )
+        self.assertNotEqual(
+            response_cache_key(model_config, {"messages": ["a"]}),
+            response_cache_key(model_config, {"messages": ["b"]}),
+        )
+
+    @patch("trae_agent.utils.llm_clients.google_client.genai.Client")
+    def test_repeated_google_request_is_replayed(self, mock_genai_client):
+        mock_genai_client.return_value.models.generate_content.return_value = (
+            types.GenerateContentResponse(
+                candidates=[
+                    types.Candidate(
+                        content=types.Content(role="model", parts=[types.Part(text="Hello!")]),
+                        finish_reason=types.FinishReason.STOP,
+                    )
+                ]
+            )
+        )
+        cache = ResponseCache(self.path)
+        model_config = _model_config()
+
+        with patch(
+            "trae_agent.utils.llm_clients.google_client.get_response_cache", return_value=cache
+        ):
+            responses = [
+                GoogleClient(model_config).chat([LLMMessage("user", "Hi")], model_config)
+                for _ in range(2)
+            ]
+
+        mock_genai_client.return_value.models.generate_content.assert_called_once()
+        self.assertEqual([response.content for response in responses], ["Hello!", "Hello!"])
+        self.assertEqual(responses[1].finish_reason, "STOP")
+
+
+if __name__ == "__main__":
+    unittest.main()
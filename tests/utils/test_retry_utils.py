@@ -0,0 +1,85 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from trae_agent.utils.llm_clients.retry_utils import (
+    CircuitBreaker,
+    CircuitOpenError,
+    is_retryable,
+    retry_with,
+)
+
+
+class _APIError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code: int = status_code
+
+
+class TestRetryWith(unittest.TestCase):
+    def test_classifies_errors(self):
+        self.assertTrue(is_retryable(_APIError(429)))
+        self.assertTrue(is_retryable(_APIError(503)))
+        self.assertTrue(is_retryable(TimeoutError("timed out")))
+        self.assertFalse(is_retryable(_APIError(400)))
+        self.assertFalse(is_retryable(_APIError(401)))
+
+    @patch("trae_agent.utils.llm_clients.retry_utils.time.sleep")
+    def test_deterministic_errors_are_not_retried(self, mock_sleep):
+        func = MagicMock(side_effect=_APIError(401), __name__="call")
+        with self.assertRaises(_APIError):
+            retry_with(func, provider_name="test-deterministic", max_retries=3)()
+        func.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("trae_agent.utils.llm_clients.retry_utils.time.sleep")
+    def test_transient_errors_are_retried(self, mock_sleep):
+        func = MagicMock(side_effect=[_APIError(503), "ok"], __name__="call")
+        result = retry_with(func, provider_name="test-transient", max_retries=3)()
+        self.assertEqual(result, "ok")
+        self.assertEqual(func.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch("trae_agent.utils.llm_clients.retry_utils.time.sleep")
+    def test_open_circuit_stops_later_calls(self, mock_sleep):
+        func = MagicMock(side_effect=_APIError(503), __name__="call")
+        # The call under way uses all of its retries even after the circuit opens
+        with self.assertRaises(_APIError):
+            retry_with(func, provider_name="test-outage", max_retries=10)()
+        self.assertEqual(func.call_count, 11)
+
+        func.reset_mock()
+        with self.assertRaises(CircuitOpenError):
+            retry_with(func, provider_name="test-outage", max_retries=10)()
+        func.assert_not_called()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_reopens_after_failed_trial_call(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        # With no timeout the circuit lets a trial call through straight away
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertIsNotNone(breaker._opened_at)
+        breaker.record_success()
+        self.assertIsNone(breaker._opened_at)
+
+    def test_lets_a_single_trial_call_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        assert breaker._opened_at is not None
+        breaker._opened_at -= 31.0
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
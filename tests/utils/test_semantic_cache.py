@@ -0,0 +1,199 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import math
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from trae_agent.utils.config import ModelConfig, ModelProvider
+from trae_agent.utils.llm_clients._semantic_cache import SemanticCache, semantic_cache_scope
+from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse
+from trae_agent.utils.llm_clients.llm_client import LLMClient
+
+MODEL_CONFIG = ModelConfig(
+    model="gemini-2.5-flash",
+    model_provider=ModelProvider(api_key="test-api-key", provider="google"),
+    max_tokens=1000,
+    temperature=0.0,
+    top_p=1.0,
+    top_k=1,
+    parallel_tool_calls=False,
+    max_retries=0,
+    semantic_cache_threshold=0.95,
+)
+
+# Unit vectors standing in for sentence embeddings; the paraphrase is 0.99 similar to the original
+_EMBEDDINGS = {
+    "Ran the tests": [1.0, 0.0],
+    "Executed the tests": [0.99, math.sqrt(1 - 0.99**2)],
+    "Wrote the docs": [0.0, 1.0],
+}
+
+
+class _StubEmbedding(list[float]):
+    def tolist(self) -> list[float]:
+        return list(self)
+
+
+class _StubEncoder:
+    """Stand-in for a SentenceTransformer that knows the texts in _EMBEDDINGS."""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return 2
+
+    def encode(self, text: str, normalize_embeddings: bool) -> _StubEmbedding:
+        return _StubEmbedding(_EMBEDDINGS[text])
+
+
+class _StubIndex:
+    """Brute-force stand-in for an hnswlib cosine index."""
+
+    def __init__(self, space: str, dim: int):
+        self._max_elements = 0
+        self._vectors: dict[int, list[float]] = {}
+
+    def init_index(self, max_elements: int) -> None:
+        self._max_elements = max_elements
+
+    def get_max_elements(self) -> int:
+        return self._max_elements
+
+    def resize_index(self, max_elements: int) -> None:
+        self._max_elements = max_elements
+
+    def add_items(self, data: list[list[float]], ids: list[int]) -> None:
+        self._vectors.update(zip(ids, data, strict=True))
+
+    def knn_query(self, data: list[list[float]], k: int):
+        distances = {
+            label: 1 - sum(a * b for a, b in zip(data[0], vector, strict=True))
+            for label, vector in self._vectors.items()
+        }
+        labels = sorted(distances, key=distances.__getitem__)[:k]
+        return [labels], [[distances[label] for label in labels]]
+
+
+def _stub_semantic_cache(path: Path) -> SemanticCache:
+    with patch.dict(
+        sys.modules,
+        {
+            "hnswlib": SimpleNamespace(Index=_StubIndex),
+            "sentence_transformers": SimpleNamespace(SentenceTransformer=_StubEncoder),
+        },
+    ):
+        return SemanticCache(path)
+
+
+class TestSemanticCacheScope(unittest.TestCase):
+    def test_scope_ignores_only_the_last_user_message(self):
+        system = LLMMessage("system", "Summarise the step.")
+        first = semantic_cache_scope(
+            MODEL_CONFIG, [system, LLMMessage("user", "Ran the tests")], None
+        )
+        second = semantic_cache_scope(
+            MODEL_CONFIG, [system, LLMMessage("user", "Executed the tests")], None
+        )
+        other = semantic_cache_scope(
+            MODEL_CONFIG,
+            [LLMMessage("system", "Tag the step."), LLMMessage("user", "Ran the tests")],
+            None,
+        )
+        assert first and second and other
+        self.assertEqual(first[0], second[0])
+        self.assertNotEqual(first[0], other[0])
+        self.assertEqual(first[1], "Ran the tests")
+
+    def test_requests_not_ending_in_a_user_message_have_no_scope(self):
+        self.assertIsNone(semantic_cache_scope(MODEL_CONFIG, [], None))
+        self.assertIsNone(
+            semantic_cache_scope(MODEL_CONFIG, [LLMMessage("assistant", "Done")], None)
+        )
+
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "semantic_cache.jsonl"
+        self.cache = _stub_semantic_cache(self.path)
+        self.cache.store("scope", "Ran the tests", LLMResponse(content="The tests pass."))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lookup_returns_response_to_close_paraphrase(self):
+        response = self.cache.lookup("scope", "Executed the tests", threshold=0.95)
+        assert response is not None
+        self.assertEqual(response.content, "The tests pass.")
+
+    def test_lookup_misses_below_threshold(self):
+        self.assertIsNone(self.cache.lookup("scope", "Executed the tests", threshold=0.999))
+        self.assertIsNone(self.cache.lookup("scope", "Wrote the docs", threshold=0.5))
+
+    def test_lookup_misses_other_scope(self):
+        self.assertIsNone(self.cache.lookup("other scope", "Ran the tests", threshold=0.95))
+
+    def test_stored_responses_are_reloaded(self):
+        reopened = _stub_semantic_cache(self.path)
+        response = reopened.lookup("scope", "Ran the tests", threshold=0.95)
+        assert response is not None
+        self.assertEqual(response.content, "The tests pass.")
+
+
+class TestSemanticChat(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = _stub_semantic_cache(Path(self.temp_dir.name) / "semantic_cache.jsonl")
+        with patch("trae_agent.utils.llm_clients.google_client.genai.Client"):
+            self.llm_client = LLMClient(MODEL_CONFIG)
+        self.client = MagicMock()
+        self.client.chat.return_value = LLMResponse(content="The tests pass.")
+        self.llm_client.client = self.client
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _chat(self, text: str) -> LLMResponse:
+        return self.llm_client.chat(
+            [LLMMessage("system", "Summarise the step."), LLMMessage("user", text)],
+            MODEL_CONFIG,
+            reuse_history=False,
+        )
+
+    @patch("trae_agent.utils.llm_clients.llm_client.get_semantic_cache")
+    def test_paraphrase_is_answered_from_cache(self, mock_get_semantic_cache):
+        mock_get_semantic_cache.return_value = self.cache
+        first = self._chat("Ran the tests")
+        second = self._chat("Executed the tests")
+
+        self.client.chat.assert_called_once()
+        self.assertEqual(second.content, first.content)
+
+    @patch("trae_agent.utils.llm_clients.llm_client.get_semantic_cache")
+    def test_different_prompt_goes_to_the_provider(self, mock_get_semantic_cache):
+        mock_get_semantic_cache.return_value = self.cache
+        _ = self._chat("Ran the tests")
+        _ = self._chat("Wrote the docs")
+        self.assertEqual(self.client.chat.call_count, 2)
+
+    @patch("trae_agent.utils.llm_clients.llm_client.get_semantic_cache", return_value=None)
+    def test_unavailable_cache_falls_through(self, mock_get_semantic_cache):
+        _ = self._chat("Ran the tests")
+        _ = self._chat("Ran the tests")
+        self.assertEqual(self.client.chat.call_count, 2)
+        self.client.chat.assert_called_with(
+            [LLMMessage("system", "Summarise the step."), LLMMessage("user", "Ran the tests")],
+            MODEL_CONFIG,
+            None,
+            reuse_history=False,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
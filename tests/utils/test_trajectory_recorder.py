@@ -0,0 +1,55 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from trae_agent.utils.trajectory_recorder import TrajectoryRecorder
+
+
+class TestTrajectoryRecorder(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.trajectory_path = Path(self.temp_dir.name) / "trajectory.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read(self) -> dict:
+        return json.loads(self.trajectory_path.read_text(encoding="utf-8"))
+
+    def test_saves_immediately_outside_event_loop(self):
+        recorder = TrajectoryRecorder(str(self.trajectory_path))
+        recorder.start_recording("task", "openai", "gpt-4o", 10)
+
+        self.assertEqual(self._read()["task"], "task")
+
+    async def test_batches_updates_inside_event_loop(self):
+        recorder = TrajectoryRecorder(str(self.trajectory_path), flush_interval=0.01)
+        recorder.start_recording("task", "openai", "gpt-4o", 10)
+        recorder.record_agent_step(step_number=1, state="thinking")
+        recorder.record_agent_step(step_number=2, state="completed")
+
+        # Nothing is written until the batched flush fires
+        self.assertFalse(self.trajectory_path.exists())
+
+        await asyncio.sleep(0.05)
+        await asyncio.get_running_loop().shutdown_default_executor()
+        self.assertEqual(len(self._read()["agent_steps"]), 2)
+
+    async def test_finalize_writes_pending_updates(self):
+        recorder = TrajectoryRecorder(str(self.trajectory_path), flush_interval=60)
+        recorder.start_recording("task", "openai", "gpt-4o", 10)
+        recorder.record_agent_step(step_number=1, state="completed")
+        recorder.finalize_recording(success=True, final_result="done")
+
+        data = self._read()
+        self.assertTrue(data["success"])
+        self.assertEqual(len(data["agent_steps"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""Precompile a YAML config into a Python module that Trae Agent can load without parsing YAML.
+
+Usage:
+    python tools/precompile_config.py [trae_config.yaml] [trae_config_data.py]
+
+The generated module defines a single ``CONFIG`` dict literal and can be passed anywhere a
+config file is accepted (e.g. ``trae-cli run --config-file trae_config_data.py``). Regenerate
+it whenever the YAML config changes; ``make config`` does this for the default file names.
+"""
+
+import argparse
+import ast
+import pprint
+import sys
+
+import yaml
+
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def precompile_config(yaml_file: str, output_file: str) -> None:
+    with open(yaml_file, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+    if not isinstance(config, dict):
+        raise ValueError(f"{yaml_file} does not contain a YAML mapping")
+
+    literal = pprint.pformat(config, sort_dicts=False)
+    # The output must stay a pure literal; YAML types such as timestamps would need imports
+    if ast.literal_eval(literal) != config:
+        raise ValueError(f"{yaml_file} contains values that cannot be written as Python literals")
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        _ = f.write(f"# Generated by tools/precompile_config.py from {yaml_file}. Do not edit.\n\n")
+        _ = f.write(f"CONFIG = {literal}\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("yaml_file", nargs="?", default="trae_config.yaml")
+    _ = parser.add_argument("output_file", nargs="?", default="trae_config_data.py")
+    args = parser.parse_args()
+
+    try:
+        precompile_config(args.yaml_file, args.output_file)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {args.output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -88,6 +88,8 @@ class Agent:
             # Ensure MCP cleanup happens even if execution fails
             with contextlib.suppress(Exception):
                 await self.agent.cleanup_mcp_clients()
+            # Persist batched trajectory updates if execution was interrupted
+            self.trajectory_recorder.flush()
 
         if cli_console_task:
             await cli_console_task
@@ -147,6 +147,10 @@ class BaseAgent(ABC):
         # Ensure tool resources are released whether an exception occurs or not.
         await self._close_tools()
 
+        # Give back what the LLM client holds on the provider's side, e.g. Gemini context caches
+        with contextlib.suppress(Exception):
+            await self._llm_client.aclose()
+
         execution.execution_time = time.time() - start_time
 
         # Clean up any MCP clients
@@ -169,8 +173,8 @@ class BaseAgent(ABC):
         # Display thinking state
         step.state = AgentStepState.THINKING
         self._update_cli_console(step, execution)
-        # Get LLM response
-        llm_response = self._llm_client.chat(messages, self._model_config, self._tools)
+        # Get LLM response without blocking other agents sharing the event loop
+        llm_response = await self._llm_client.achat(messages, self._model_config, self._tools)
         step.llm_response = llm_response
 
         # Display step with LLM response
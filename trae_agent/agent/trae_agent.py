@@ -7,7 +7,7 @@ import asyncio
 import contextlib
 import os
 import subprocess
-from typing import override
+from typing import TYPE_CHECKING, override
 
 from trae_agent.agent.agent_basics import AgentError, AgentExecution
 from trae_agent.agent.base_agent import BaseAgent
@@ -16,7 +16,9 @@ from trae_agent.tools import tools_registry
 from trae_agent.tools.base import Tool, ToolExecutor, ToolResult
 from trae_agent.utils.config import MCPServerConfig, TraeAgentConfig
 from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse
-from trae_agent.utils.mcp_client import MCPClient
+
+if TYPE_CHECKING:
+    from trae_agent.utils.mcp_client import MCPClient
 
 TraeAgentToolNames = [
     "str_replace_based_edit_tool",
@@ -61,34 +63,32 @@ class TraeAgent(BaseAgent):
             self._tools.extend(self.mcp_tools)
 
     async def discover_mcp_tools(self):
-        if self.mcp_servers_config:
-            for mcp_server_name, mcp_server_config in self.mcp_servers_config.items():
-                if self.allow_mcp_servers is None:
-                    return
-                if mcp_server_name not in self.allow_mcp_servers:
-                    continue
-                mcp_client = MCPClient()
-                try:
-                    await mcp_client.connect_and_discover(
-                        mcp_server_name,
-                        mcp_server_config,
-                        self.mcp_tools,
-                        self._llm_client.provider.value,
-                    )
-                    # Store client for later cleanup
-                    self.mcp_clients.append(mcp_client)
-                except Exception:
-                    # Clean up failed client
-                    with contextlib.suppress(Exception):
-                        await mcp_client.cleanup(mcp_server_name)
-                    continue
-                except asyncio.CancelledError:
-                    # If the task is cancelled, clean up and skip this server
-                    with contextlib.suppress(Exception):
-                        await mcp_client.cleanup(mcp_server_name)
-                    continue
-        else:
+        if not self.mcp_servers_config or self.allow_mcp_servers is None:
+            return
+        allowed_servers = {
+            mcp_server_name: mcp_server_config
+            for mcp_server_name, mcp_server_config in self.mcp_servers_config.items()
+            if mcp_server_name in self.allow_mcp_servers
+        }
+        if not allowed_servers:
+            return
+
+        # The MCP SDK is only loaded when servers are configured, as it is slow to import
+        from trae_agent.utils.mcp_client import MCPClient
+
+        # One client connects to all servers at once; those that fail contribute no tools
+        mcp_client = MCPClient()
+        try:
+            _ = await mcp_client.connect_all(
+                allowed_servers, self.mcp_tools, self._llm_client.provider.value
+            )
+        except (Exception, asyncio.CancelledError):
+            # Clean up the failed client
+            with contextlib.suppress(Exception):
+                await mcp_client.cleanup()
             return
+        # Store client for later cleanup
+        self.mcp_clients.append(mcp_client)
 
     @override
     def new_task(
@@ -241,6 +241,5 @@ class TraeAgent(BaseAgent):
         """Clean up all MCP clients to prevent async context leaks."""
         for client in self.mcp_clients:
             with contextlib.suppress(Exception):
-                # Use a generic server name for cleanup since we don't track which server each client is for
-                await client.cleanup("cleanup")
+                await client.cleanup()
         self.mcp_clients.clear()
@@ -4,9 +4,11 @@
 """Command Line Interface for Trae Agent."""
 
 import asyncio
+import json
 import os
 import sys
 import traceback
+from datetime import datetime
 from pathlib import Path
 
 import click
@@ -16,7 +18,14 @@ from rich.panel import Panel
 from rich.table import Table
 
 from trae_agent.agent import Agent
-from trae_agent.utils.cli import CLIConsole, ConsoleFactory, ConsoleMode, ConsoleType
+from trae_agent.agent.agent import AgentType
+from trae_agent.utils.cli import (
+    CLIConsole,
+    ConsoleFactory,
+    ConsoleMode,
+    ConsoleType,
+    RichCLIConsole,
+)
 from trae_agent.utils.config import Config, TraeAgentConfig
 
 # Load environment variables
@@ -24,6 +33,25 @@ _ = load_dotenv()
 
 console = Console()
 
+# Click normalises choices to their declared spelling, so plain lookups are enough
+_CONSOLE_TYPE_MAP: dict[str, ConsoleType] = {t.value: t for t in ConsoleType}
+_AGENT_TYPE_MAP: dict[str, AgentType] = {t.value: t for t in AgentType}
+
+
+def _select_agent_type(agent_type: str | None) -> AgentType:
+    """Look up the agent type, exiting with an error if it is missing or unknown."""
+    if not agent_type:
+        console.print("[red]Error: agent_type is required.[/red]")
+        sys.exit(1)
+    selected_agent_type = _AGENT_TYPE_MAP.get(agent_type)
+    if selected_agent_type is None:
+        console.print(
+            f"[red]Error: unknown agent_type '{agent_type}'. "
+            f"Valid values: {', '.join(_AGENT_TYPE_MAP)}[/red]"
+        )
+        sys.exit(1)
+    return selected_agent_type
+
 
 def resolve_config_file(config_file: str) -> str:
     """
@@ -143,28 +171,27 @@ def run(
         max_steps=max_steps,
     )
 
-    if not agent_type:
-        console.print("[red]Error: agent_type is required.[/red]")
-        sys.exit(1)
+    selected_agent_type = _select_agent_type(agent_type)
 
     # Create CLI Console
     console_mode = ConsoleMode.RUN
-    if console_type:
-        selected_console_type = (
-            ConsoleType.SIMPLE if console_type.lower() == "simple" else ConsoleType.RICH
-        )
-    else:
-        selected_console_type = ConsoleFactory.get_recommended_console_type(console_mode)
+    selected_console_type = _CONSOLE_TYPE_MAP.get(console_type or "") or (
+        ConsoleFactory.get_recommended_console_type(console_mode)
+    )
 
     cli_console = ConsoleFactory.create_console(
         console_type=selected_console_type, mode=console_mode
     )
+    is_rich = isinstance(cli_console, RichCLIConsole)
 
     # For rich console in RUN mode, set the initial task
-    if selected_console_type == ConsoleType.RICH and hasattr(cli_console, "set_initial_task"):
+    if is_rich:
         cli_console.set_initial_task(task)
 
-    agent = Agent(agent_type, config, trajectory_file, cli_console)
+    agent = Agent(selected_agent_type, config, trajectory_file, cli_console)
+
+    # Get the actual trajectory file path once (in case it was auto-generated)
+    trajectory_file = agent.trajectory_file
 
     # Change working directory if specified
     if working_dir:
@@ -193,22 +220,22 @@ def run(
         }
 
         # Set up agent context for rich console if applicable
-        if selected_console_type == ConsoleType.RICH and hasattr(cli_console, "set_agent_context"):
+        if is_rich:
             cli_console.set_agent_context(agent, config.trae_agent, config_file, trajectory_file)
 
         # Agent will handle starting the appropriate console
         _ = asyncio.run(agent.run(task, task_args))
 
-        console.print(f"\n[green]Trajectory saved to: {agent.trajectory_file}[/green]")
+        console.print(f"\n[green]Trajectory saved to: {trajectory_file}[/green]")
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Task execution interrupted by user[/yellow]")
-        console.print(f"[blue]Partial trajectory saved to: {agent.trajectory_file}[/blue]")
+        console.print(f"[blue]Partial trajectory saved to: {trajectory_file}[/blue]")
         sys.exit(1)
     except Exception as e:
         console.print(f"\n[red]Unexpected error: {e}[/red]")
         console.print(traceback.format_exc())
-        console.print(f"[blue]Trajectory saved to: {agent.trajectory_file}[/blue]")
+        console.print(f"[blue]Trajectory saved to: {trajectory_file}[/blue]")
         sys.exit(1)
 
 
@@ -275,41 +302,41 @@ def interactive(
 
     # Create CLI Console for interactive mode
     console_mode = ConsoleMode.INTERACTIVE
-    if console_type:
-        selected_console_type = (
-            ConsoleType.SIMPLE if console_type.lower() == "simple" else ConsoleType.RICH
-        )
-    else:
-        selected_console_type = ConsoleFactory.get_recommended_console_type(console_mode)
+    selected_console_type = _CONSOLE_TYPE_MAP.get(console_type or "") or (
+        ConsoleFactory.get_recommended_console_type(console_mode)
+    )
 
     cli_console = ConsoleFactory.create_console(
         console_type=selected_console_type, lakeview_config=config.lakeview, mode=console_mode
     )
+    is_rich = isinstance(cli_console, RichCLIConsole)
 
-    if not agent_type:
-        console.print("[red]Error: agent_type is required.[/red]")
-        sys.exit(1)
+    selected_agent_type = _select_agent_type(agent_type)
 
     # Create agent
-    agent = Agent(agent_type, config, trajectory_file, cli_console)
+    agent = Agent(selected_agent_type, config, trajectory_file, cli_console)
 
     # Get the actual trajectory file path (in case it was auto-generated)
     trajectory_file = agent.trajectory_file
 
-    # For simple console, use traditional interactive loop
-    if selected_console_type == ConsoleType.SIMPLE:
-        asyncio.run(
-            _run_simple_interactive_loop(
-                agent, cli_console, trae_agent_config, config_file, trajectory_file
-            )
-        )
-    else:
+    if is_rich:
         # For rich console, start the textual app which handles interaction
         asyncio.run(
             _run_rich_interactive_loop(
                 agent, cli_console, trae_agent_config, config_file, trajectory_file
             )
         )
+    else:
+        # For simple console, use traditional interactive loop
+        try:
+            asyncio.run(
+                _run_simple_interactive_loop(
+                    agent, cli_console, trae_agent_config, config_file, trajectory_file
+                )
+            )
+        except KeyboardInterrupt:
+            # Ctrl-C at a prompt cancels the loop, which asyncio.run reports as KeyboardInterrupt
+            console.print("\n[green]Goodbye![/green]")
 
 
 async def _run_simple_interactive_loop(
@@ -320,9 +347,11 @@ async def _run_simple_interactive_loop(
     trajectory_file: str | None,
 ):
     """Run the interactive loop for simple console."""
+    # Tasks never change the process working directory, so resolve it once
+    current_dir = os.getcwd()
     while True:
         try:
-            task = cli_console.get_task_input()
+            task = await cli_console.get_task_input()
             if task is None:
                 console.print("[green]Goodbye![/green]")
                 break
@@ -342,7 +371,7 @@ async def _run_simple_interactive_loop(
                 )
                 continue
 
-            working_dir = cli_console.get_working_dir_input()
+            working_dir = await cli_console.get_working_dir_input()
 
             if task.lower() == "status":
                 console.print(
@@ -351,7 +380,7 @@ async def _run_simple_interactive_loop(
     [bold]Model:[/bold] {agent.agent_config.model.model}
     [bold]Available Tools:[/bold] {len(agent.agent.tools)}
     [bold]Config File:[/bold] {config_file}
-    [bold]Working Directory:[/bold] {os.getcwd()}""",
+    [bold]Working Directory:[/bold] {current_dir}""",
                         title="Agent Status",
                         border_style="blue",
                     )
@@ -395,20 +424,187 @@ async def _run_simple_interactive_loop(
 
 async def _run_rich_interactive_loop(
     agent: Agent,
-    cli_console: CLIConsole,
+    cli_console: RichCLIConsole,
     trae_agent_config: TraeAgentConfig,
     config_file: str,
     trajectory_file: str | None,
 ):
     """Run the interactive loop for rich console."""
     # Set up the agent in the rich console so it can handle task execution
-    if hasattr(cli_console, "set_agent_context"):
-        cli_console.set_agent_context(agent, trae_agent_config, config_file, trajectory_file)
+    cli_console.set_agent_context(agent, trae_agent_config, config_file, trajectory_file)
 
     # Start the console UI - this will handle the entire interaction
     await cli_console.start()
 
 
+@cli.command()
+@click.option(
+    "--tasks-file",
+    required=True,
+    help="Path to a JSONL file with one task per line.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    help="Maximum number of tasks to run at the same time",
+    type=click.IntRange(min=1),
+    default=4,
+)
+@click.option("--provider", "-p", help="LLM provider to use")
+@click.option("--model", "-m", help="Specific model to use")
+@click.option("--model-base-url", help="Base URL for the model API")
+@click.option("--api-key", "-k", help="API key (or set via environment variable)")
+@click.option("--max-steps", help="Maximum number of execution steps", type=int)
+@click.option(
+    "--config-file",
+    help="Path to configuration file",
+    default="trae_config.yaml",
+    envvar="TRAE_CONFIG_FILE",
+)
+@click.option(
+    "--agent-type",
+    "-at",
+    type=click.Choice(["trae_agent"], case_sensitive=False),
+    help="Type of agent to use (trae_agent)",
+    default="trae_agent",
+)
+def batch(
+    tasks_file: str,
+    concurrency: int = 4,
+    provider: str | None = None,
+    model: str | None = None,
+    model_base_url: str | None = None,
+    api_key: str | None = None,
+    max_steps: int | None = None,
+    config_file: str = "trae_config.yaml",
+    agent_type: str | None = "trae_agent",
+):
+    """
+    Run several independent tasks concurrently in a single process.
+    Args:
+        tasks_file: JSONL file where each line is an object with a `task` and an absolute
+            `working_dir`, plus optional `must_patch`, `patch_path` and `trajectory_file`
+        concurrency: the maximum number of agents running at the same time
+    """
+    # Apply backward compatibility for config file
+    config_file = resolve_config_file(config_file)
+
+    tasks = _load_batch_tasks(tasks_file)
+
+    config = Config.create(
+        config_file=config_file,
+    ).resolve_config_values(
+        provider=provider,
+        model=model,
+        model_base_url=model_base_url,
+        api_key=api_key,
+        max_steps=max_steps,
+    )
+
+    selected_agent_type = _select_agent_type(agent_type)
+
+    console.print(f"[blue]Running {len(tasks)} tasks with concurrency {concurrency}[/blue]")
+    results = asyncio.run(_run_batch(selected_agent_type, config, tasks, concurrency))
+
+    results_table = Table(title="Batch Results")
+    results_table.add_column("#", style="cyan")
+    results_table.add_column("Task", style="green")
+    results_table.add_column("Success")
+    results_table.add_column("Trajectory File", style="blue")
+
+    failed = 0
+    for index, (task_spec, (success, trajectory_file, error)) in enumerate(
+        zip(tasks, results, strict=True)
+    ):
+        if not success:
+            failed += 1
+        task = task_spec["task"]
+        results_table.add_row(
+            str(index),
+            task[:50] + "..." if len(task) > 50 else task,
+            "✅ Yes" if success else f"❌ No{f' ({error})' if error else ''}",
+            trajectory_file or "-",
+        )
+
+    console.print(results_table)
+    if failed:
+        sys.exit(1)
+
+
+def _load_batch_tasks(tasks_file: str) -> list[dict[str, str]]:
+    """Read and validate the task specs of a batch run."""
+    try:
+        lines = Path(tasks_file).read_text().splitlines()
+    except FileNotFoundError:
+        console.print(f"[red]Error: File not found: {tasks_file}[/red]")
+        sys.exit(1)
+
+    tasks: list[dict[str, str]] = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            task_spec = json.loads(line)
+        except json.JSONDecodeError as e:
+            console.print(f"[red]Error: Invalid JSON on line {line_number}: {e}[/red]")
+            sys.exit(1)
+        if not isinstance(task_spec, dict) or not task_spec.get("task"):
+            console.print(f"[red]Error: Missing task on line {line_number}[/red]")
+            sys.exit(1)
+        working_dir = task_spec.get("working_dir")
+        if not working_dir or not Path(working_dir).is_absolute():
+            console.print(
+                f"[red]Error: working_dir on line {line_number} must be an absolute path[/red]"
+            )
+            sys.exit(1)
+        tasks.append(task_spec)
+
+    if not tasks:
+        console.print(f"[red]Error: No tasks found in {tasks_file}[/red]")
+        sys.exit(1)
+    return tasks
+
+
+async def _run_batch(
+    agent_type: AgentType,
+    config: Config,
+    tasks: list[dict[str, str]],
+    concurrency: int,
+) -> list[tuple[bool, str | None, str | None]]:
+    """Run the batch tasks with at most `concurrency` agents in flight.
+
+    Returns one (success, trajectory_file, error) tuple per task, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    # Auto-generated trajectory names only have second resolution, so suffix the task index
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    async def run_one(index: int, task_spec: dict[str, str]):
+        trajectory_file = (
+            task_spec.get("trajectory_file") or f"trajectories/trajectory_{timestamp}_{index}.json"
+        )
+        task_args = {
+            "project_path": task_spec["working_dir"],
+            "issue": task_spec["task"],
+            "must_patch": "true" if task_spec.get("must_patch") else "false",
+        }
+        if task_spec.get("patch_path"):
+            task_args["patch_path"] = task_spec["patch_path"]
+
+        async with semaphore:
+            try:
+                agent = Agent(agent_type, config, trajectory_file)
+            except Exception as e:
+                return False, None, str(e)
+            try:
+                execution = await agent.run(task_spec["task"], task_args)
+            except Exception as e:
+                return False, agent.trajectory_file, str(e)
+            return execution.success, agent.trajectory_file, None
+
+    return await asyncio.gather(*(run_one(i, t) for i, t in enumerate(tasks)))
+
+
 @cli.command()
 @click.option(
     "--config-file",
@@ -6,10 +6,17 @@ from .base import Tool, ToolCallArguments, ToolExecResult, ToolParameter
 
 
 class MCPTool(Tool):
-    def __init__(self, client, tool: mcp.types.Tool, model_provider: str | None = None):
+    def __init__(
+        self,
+        client,
+        tool: mcp.types.Tool,
+        model_provider: str | None = None,
+        mcp_server_name: str | None = None,
+    ):
         super().__init__(model_provider)
         self.client = client
         self.tool = tool
+        self.mcp_server_name = mcp_server_name
 
     @override
     def get_model_provider(self) -> str | None:
@@ -48,7 +55,7 @@ class MCPTool(Tool):
     @override
     async def execute(self, arguments: ToolCallArguments) -> ToolExecResult:
         try:
-            output = await self.client.call_tool(self.get_name(), arguments)
+            output = await self.client.call_tool(self.get_name(), arguments, self.mcp_server_name)
             if output.isError:
                 return ToolExecResult(output=None, error=output.content[0].text)
             else:
@@ -5,11 +5,16 @@
 
 import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
+from functools import cache
+from types import MappingProxyType
 
 from rich.panel import Panel
+from rich.style import Style
 from rich.table import Table
+from rich.text import Text
 
 from trae_agent.agent.agent_basics import AgentExecution, AgentStep, AgentStepState
 from trae_agent.utils.config import LakeviewConfig
@@ -30,16 +35,19 @@ class ConsoleType(Enum):
     RICH = "rich"  # Rich textual-based console with TUI
 
 
-AGENT_STATE_INFO = {
-    AgentStepState.THINKING: ("blue", "🤔"),
-    AgentStepState.CALLING_TOOL: ("yellow", "🔧"),
-    AgentStepState.REFLECTING: ("magenta", "💭"),
-    AgentStepState.COMPLETED: ("green", "✅"),
-    AgentStepState.ERROR: ("red", "❌"),
-}
+# Covers every AgentStepState, so renderers index it directly instead of using a default
+AGENT_STATE_INFO: Mapping[AgentStepState, tuple[str, str]] = MappingProxyType(
+    {
+        AgentStepState.THINKING: ("blue", "🤔"),
+        AgentStepState.CALLING_TOOL: ("yellow", "🔧"),
+        AgentStepState.REFLECTING: ("magenta", "💭"),
+        AgentStepState.COMPLETED: ("green", "✅"),
+        AgentStepState.ERROR: ("red", "❌"),
+    }
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsoleStep:
     """Represents a console step with its display panel and lakeview information."""
 
@@ -51,6 +59,9 @@ class ConsoleStep:
 class CLIConsole(ABC):
     """Base class for CLI console implementations."""
 
+    # Upper bound on lakeview summaries (each an LLM call) generated at the same time
+    LAKEVIEW_MAX_CONCURRENCY: int = 4
+
     def __init__(
         self, mode: ConsoleMode = ConsoleMode.RUN, lakeview_config: LakeviewConfig | None = None
     ):
@@ -64,6 +75,9 @@ class CLIConsole(ABC):
         self.set_lakeview(lakeview_config)
         self.console_step_history: dict[int, ConsoleStep] = {}
         self.agent_execution: AgentExecution | None = None
+        self._lakeview_semaphore: asyncio.Semaphore = asyncio.Semaphore(
+            self.LAKEVIEW_MAX_CONCURRENCY
+        )
 
     @abstractmethod
     async def start(self):
@@ -93,7 +107,7 @@ class CLIConsole(ABC):
         pass
 
     @abstractmethod
-    def get_task_input(self) -> str | None:
+    async def get_task_input(self) -> str | None:
         """Get task input from user (for interactive mode).
 
         Returns:
@@ -102,7 +116,7 @@ class CLIConsole(ABC):
         pass
 
     @abstractmethod
-    def get_working_dir_input(self) -> str:
+    async def get_working_dir_input(self) -> str:
         """Get working directory input from user (for interactive mode).
 
         Returns:
@@ -123,9 +137,19 @@ class CLIConsole(ABC):
             self.lake_view = None
 
 
+@cache
+def _message_style(color: str, bold: bool) -> Style:
+    return Style(color=color, bold=bold)
+
+
+def format_message(message: str, color: str = "blue", bold: bool = False) -> Text:
+    """Style a console message without a round trip through the markup parser."""
+    return Text(message, style=_message_style(color, bold))
+
+
 def generate_agent_step_table(agent_step: AgentStep) -> Table:
     """Log an agent step to the console."""
-    color, emoji = AGENT_STATE_INFO.get(agent_step.state, ("white", "❓"))
+    color, emoji = AGENT_STATE_INFO[agent_step.state]
 
     # Print the step state in a table
     table = Table(show_header=False, width=120)
@@ -147,16 +171,17 @@ def generate_agent_step_table(agent_step: AgentStep) -> Table:
         tool_names = [f"[cyan]{call.name}[/cyan]" for call in agent_step.tool_calls]
         table.add_row("Tools", f"🔧 {', '.join(tool_names)}")
 
+        # Index results once so matching them to calls stays linear; the first result wins
+        results_by_id: dict[str, str] = {}
+        for tool_result in agent_step.tool_results or ():
+            _ = results_by_id.setdefault(tool_result.call_id, tool_result.result or "")
+
         for tool_call in agent_step.tool_calls:
             # Build a tool call table with tool name, arguments and result
             tool_call_table = Table(show_header=False, width=100)
             tool_call_table.add_column("Arguments", style="green", width=50)
             tool_call_table.add_column("Result", style="green", width=50)
-            tool_result_str = ""
-            for tool_result in agent_step.tool_results or []:
-                if tool_result.call_id == tool_call.call_id:
-                    tool_result_str = tool_result.result or ""
-                    break
+            tool_result_str = results_by_id.get(tool_call.call_id, "")
             tool_call_table.add_row(f"{tool_call.arguments}", f"{tool_result_str}")
             table.add_row(tool_call.name, tool_call_table)
 
@@ -13,8 +13,14 @@ from .simple_console import SimpleCLIConsole
 class ConsoleFactory:
     """Factory class for creating CLI console instances."""
 
-    @staticmethod
+    _REGISTRY: dict[ConsoleType, type[CLIConsole]] = {
+        ConsoleType.SIMPLE: SimpleCLIConsole,
+        ConsoleType.RICH: RichCLIConsole,
+    }
+
+    @classmethod
     def create_console(
+        cls,
         console_type: ConsoleType,
         mode: ConsoleMode = ConsoleMode.RUN,
         lakeview_config: LakeviewConfig | None = None,
@@ -32,11 +38,10 @@ class ConsoleFactory:
         Raises:
             ValueError: If console_type is not supported
         """
-
-        if console_type == ConsoleType.SIMPLE:
-            return SimpleCLIConsole(mode=mode, lakeview_config=lakeview_config)
-        elif console_type == ConsoleType.RICH:
-            return RichCLIConsole(mode=mode, lakeview_config=lakeview_config)
+        console_cls = cls._REGISTRY.get(console_type)
+        if console_cls is None:
+            raise ValueError(f"Unsupported console type: {console_type}")
+        return console_cls(mode=mode, lakeview_config=lakeview_config)
 
     @staticmethod
     def get_recommended_console_type(mode: ConsoleMode) -> ConsoleType:
@@ -4,9 +4,14 @@
 """Rich CLI Console implementation using Textual TUI."""
 
 import asyncio
+import contextlib
 import os
+import re
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 from typing import override
 
+from rich.console import RenderableType
 from rich.panel import Panel
 from rich.text import Text
 from textual import on
@@ -22,6 +27,7 @@ from trae_agent.utils.cli.cli_console import (
     CLIConsole,
     ConsoleMode,
     ConsoleStep,
+    format_message,
     generate_agent_step_table,
 )
 from trae_agent.utils.config import LakeviewConfig
@@ -30,28 +36,30 @@ from trae_agent.utils.config import LakeviewConfig
 class TokenDisplay(Static):
     """Widget to display real-time token usage."""
 
-    total_tokens: reactive[int] = reactive(0)
-    input_tokens: reactive[int] = reactive(0)
-    output_tokens: reactive[int] = reactive(0)
+    EMPTY_TEXT: str = "Tokens: 0 total"
+
+    # A single reactive, so each update triggers one refresh instead of three
+    display_text: reactive[str] = reactive(EMPTY_TEXT)
 
     @override
     def render(self) -> Text:
         """Render the token display."""
-        if self.total_tokens > 0:
-            return Text(
-                f"Tokens: {self.total_tokens:,} total | "
-                + f"Input: {self.input_tokens:,} | "
-                + f"Output: {self.output_tokens:,}",
-                style="bold blue",
-            )
-        return Text("Tokens: 0 total", style="dim")
+        if self.display_text == self.EMPTY_TEXT:
+            return Text(self.display_text, style="dim")
+        return Text(self.display_text, style="bold blue")
 
     def update_tokens(self, agent_execution: AgentExecution):
         """Update token counts from agent execution."""
         if agent_execution and agent_execution.total_tokens:
-            self.input_tokens = agent_execution.total_tokens.input_tokens
-            self.output_tokens = agent_execution.total_tokens.output_tokens
-            self.total_tokens = self.input_tokens + self.output_tokens
+            input_tokens = agent_execution.total_tokens.input_tokens
+            output_tokens = agent_execution.total_tokens.output_tokens
+            total_tokens = input_tokens + output_tokens
+            if total_tokens > 0:
+                self.display_text = (
+                    f"Tokens: {total_tokens:,} total | "
+                    + f"Input: {input_tokens:,} | "
+                    + f"Output: {output_tokens:,}"
+                )
 
 
 class RichConsoleApp(App[None]):
@@ -64,6 +72,20 @@ class RichConsoleApp(App[None]):
         ("ctrl+q", "quit", "Quit"),
     ]
 
+    # Static content is parsed once; RichLog renders a renderable when it is written
+    _HELP_PANEL: Panel = Panel(
+        Text.from_markup(
+            """[bold]Available Commands:[/bold]
+
+• Type any task description to execute it
+• 'status' - Show agent status
+• 'clear' - Clear the execution log
+• 'exit' or 'quit' - End the session"""
+        ),
+        title="Help",
+        border_style="yellow",
+    )
+
     def __init__(self, console_impl: "RichCLIConsole"):
         super().__init__()
         self.console_impl: "RichCLIConsole" = console_impl
@@ -74,6 +96,16 @@ class RichConsoleApp(App[None]):
         self.current_task: str | None = None
         self.is_running_task: bool = False
 
+        # Reused for every submitted task; only its content changes
+        self._task_panel: Panel = Panel("", title="Current Task", border_style="green")
+
+        # Log writes are buffered and flushed together once per refresh
+        self._pending_writes: list[RenderableType] = []
+        self._flush_scheduled: bool = False
+
+        # Set when the user asks to quit, so pending pauses end immediately
+        self._exit_request: asyncio.Event = asyncio.Event()
+
         self.options: list[str] = ["help", "exit", "status", "clear"]
 
     @override
@@ -107,6 +139,8 @@ class RichConsoleApp(App[None]):
         """Called when the app is mounted."""
         self.title = "Trae Agent CLI"
 
+        # Widget handles are looked up exactly once here; the rest of the app only uses these
+        # attributes and must not call query_one, which walks the DOM on every call.
         self.execution_log = self.query_one("#execution_log", RichLog)
         self.token_display = self.query_one("#token_display", TokenDisplay)
         self.task_display = self.query_one("#task_display", Static)
@@ -131,23 +165,16 @@ class RichConsoleApp(App[None]):
         if not task:
             return
 
-        handlers: dict = {
-            "exit": self._exit_handler,
-            "quit": self._exit_handler,
-            "help": self._help_handler,
-            "clear": self._clear_handler,
-            "status": self._status_handler,
-        }
-
-        handler = handlers.get(task.lower())
-        if handler:
-            handler(event) if task.lower() not in ["exit", "quit"] else handler()
+        command = self._COMMAND_RE.fullmatch(task)
+        if command:
+            self._COMMAND_HANDLERS[command.group().lower()](self, event)
             return
 
         # Execute the task
         self.current_task = task
         if self.task_display:
-            _ = self.task_display.update(Panel(task, title="Current Task", border_style="green"))
+            self._task_panel.renderable = task
+            _ = self.task_display.update(self._task_panel)
         event.input.value = ""
         self.is_running_task = True
 
@@ -157,13 +184,12 @@ class RichConsoleApp(App[None]):
     async def _execute_task(self, task: str):
         """Execute a task using the agent."""
         try:
-            if not hasattr(self.console_impl, "agent") or not self.console_impl.agent:
-                if self.execution_log:
-                    _ = self.execution_log.write("[red]Error: Agent not available[/red]")
+            if not self.console_impl.agent:
+                self.queue_write("[red]Error: Agent not available[/red]")
                 return
 
             # Get working directory
-            working_dir = os.getcwd()
+            working_dir = self.console_impl.cwd
             if self.console_impl.mode == ConsoleMode.INTERACTIVE:
                 # For interactive mode, we might want to ask for working directory
                 # For now, use current directory
@@ -175,23 +201,22 @@ class RichConsoleApp(App[None]):
                 "must_patch": "false",
             }
 
-            if self.execution_log:
-                _ = self.execution_log.write(f"[blue]Executing task: {task}[/blue]")
+            self.queue_write(f"[blue]Executing task: {task}[/blue]")
 
             # Execute the task
             _ = await self.console_impl.agent.run(task, task_args)
 
-            if self.execution_log:
-                _ = self.execution_log.write("[green]Task completed successfully![/green]")
+            self.queue_write("[green]Task completed successfully![/green]")
 
         except Exception as e:
-            if self.execution_log:
-                _ = self.execution_log.write(f"[red]Error executing task: {e}[/red]")
+            self.queue_write(f"[red]Error executing task: {e}[/red]")
         finally:
             self.is_running_task = False
             if self.console_impl.mode == ConsoleMode.RUN:
                 # In run mode, exit after task completion
-                await asyncio.sleep(1)  # Brief pause to show completion
+                # Brief pause to show completion, cut short if the user quits
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._exit_request.wait(), timeout=1.0)
                 _ = self.exit()
             else:
                 # In interactive mode, clear task display and re-enable input
@@ -202,60 +227,82 @@ class RichConsoleApp(App[None]):
 
     def log_agent_step(self, agent_step: AgentStep):
         """Log an agent step to the execution log."""
-        color, _ = AGENT_STATE_INFO.get(agent_step.state, ("white", "❓"))
+        color, _ = AGENT_STATE_INFO[agent_step.state]
 
         # Create step display
         step_content = generate_agent_step_table(agent_step)
 
-        if self.execution_log:
-            _ = self.execution_log.write(
-                Panel(step_content, title=f"Step {agent_step.step_number}", border_style=color)
-            )
+        self.queue_write(
+            Panel(step_content, title=f"Step {agent_step.step_number}", border_style=color)
+        )
 
-    def _help_handler(self, event: Input.Submitted):
-        if self.execution_log:
-            self.execution_log.write(
-                Panel(
-                    """[bold]Available Commands:[/bold]
+    def queue_write(self, content: RenderableType) -> None:
+        """Buffer a write to the execution log; bursts are rendered in a single pass."""
+        if self.execution_log is None:
+            return
+        self._pending_writes.append(content)
+        if not self._flush_scheduled:
+            self._flush_scheduled = self.call_after_refresh(self._flush_writes)
+
+    def _flush_writes(self) -> None:
+        """Write all buffered content to the execution log in order."""
+        self._flush_scheduled = False
+        if self.execution_log is None or not self._pending_writes:
+            return
+        pending, self._pending_writes = self._pending_writes, []
+        with self.batch_update():
+            for content in pending:
+                _ = self.execution_log.write(content)
 
-• Type any task description to execute it
-• 'status' - Show agent status
-• 'clear' - Clear the execution log
-• 'exit' or 'quit' - End the session""",
-                    title="Help",
-                    border_style="yellow",
-                )
-            )
+    def _help_handler(self, event: Input.Submitted):
+        self.queue_write(self._HELP_PANEL)
         event.input.value = ""
 
     def _clear_handler(self, event: Input.Submitted):
+        # Drop buffered writes too, otherwise they would reappear after the clear
+        self._pending_writes.clear()
         if self.execution_log:
             _ = self.execution_log.clear()
         event.input.value = ""
 
     def _status_handler(self, event: Input.Submitted):
-        if hasattr(self.console_impl, "agent") and self.console_impl.agent:
+        if self.console_impl.agent:
             agent_info = getattr(self.console_impl.agent, "agent_config", None)
-            if agent_info and self.execution_log:
-                _ = self.execution_log.write(
+            if agent_info:
+                self.queue_write(
                     Panel(
                         f"""[bold]Provider:[/bold] {agent_info.model.model_provider.provider}
 [bold]Model:[/bold] {agent_info.model.model}
-[bold]Working Directory:[/bold] {os.getcwd()}""",
+[bold]Working Directory:[/bold] {self.console_impl.cwd}""",
                         title="Agent Status",
                         border_style="blue",
                     )
                 )
         else:
-            if self.execution_log:
-                _ = self.execution_log.write("[yellow]Agent not initialized[/yellow]")
+            self.queue_write("[yellow]Agent not initialized[/yellow]")
         event.input.value = ""
 
-    def _exit_handler(self):
+    def _exit_handler(self, event: Input.Submitted):
         self.exit()
 
+    # Built once for the class; handlers are plain functions called with the app instance
+    _COMMAND_HANDLERS: Mapping[str, Callable[["RichConsoleApp", Input.Submitted], None]] = (
+        MappingProxyType(
+            {
+                "exit": _exit_handler,
+                "quit": _exit_handler,
+                "help": _help_handler,
+                "clear": _clear_handler,
+                "status": _status_handler,
+            }
+        )
+    )
+    # Built from the handler table so the command set is defined in one place
+    _COMMAND_RE: re.Pattern[str] = re.compile("|".join(_COMMAND_HANDLERS), re.IGNORECASE)
+
     async def action_quit(self) -> None:
         """Quit the application."""
+        self._exit_request.set()
         self.console_impl.should_exit = True
         _ = self.exit()
 
@@ -272,6 +319,7 @@ class RichCLIConsole(CLIConsole):
         self.should_exit: bool = False
         self.initial_task: str | None = None
         self._is_running: bool = False
+        self._cwd_cache: str | None = None
 
         # Agent context for interactive mode
         self.agent = None
@@ -279,6 +327,13 @@ class RichCLIConsole(CLIConsole):
         self.config_file = None
         self.trajectory_file = None
 
+    @property
+    def cwd(self) -> str:
+        """Working directory used for tasks, resolved on first use."""
+        if self._cwd_cache is None:
+            self._cwd_cache = os.getcwd()
+        return self._cwd_cache
+
     @override
     async def start(self):
         """Start the rich console application."""
@@ -303,16 +358,19 @@ class RichCLIConsole(CLIConsole):
     ):
         """Update the console with agent status."""
         if agent_step and self.app:
-            if agent_step.step_number not in self.console_step_history:
+            console_step = self.console_step_history.get(agent_step.step_number)
+            if console_step is None:
                 # update step history
-                self.console_step_history[agent_step.step_number] = ConsoleStep(agent_step)
+                console_step = ConsoleStep(agent_step)
+                self.console_step_history[agent_step.step_number] = console_step
 
-            if (
-                agent_step.state in [AgentStepState.COMPLETED, AgentStepState.ERROR]
-                and not self.console_step_history[agent_step.step_number].agent_step_printed
+            # Steps that have already been logged need no further work
+            if not console_step.agent_step_printed and agent_step.state in (
+                AgentStepState.COMPLETED,
+                AgentStepState.ERROR,
             ):
                 self.app.log_agent_step(agent_step)
-                self.console_step_history[agent_step.step_number].agent_step_printed = True
+                console_step.agent_step_printed = True
 
         if agent_execution:
             self.agent_execution = agent_execution
@@ -322,31 +380,27 @@ class RichCLIConsole(CLIConsole):
     @override
     def print_task_details(self, details: dict[str, str]):
         """Print initial task configuration details."""
-        if self.app and self.app.execution_log:
-            content = "\n".join([f"[bold]{key}:[/bold] {value}" for key, value in details.items()])
-            _ = self.app.execution_log.write(
-                Panel(content, title="Task Details", border_style="blue")
-            )
+        if self.app:
+            content = "\n".join(f"[bold]{key}:[/bold] {value}" for key, value in details.items())
+            self.app.queue_write(Panel(content, title="Task Details", border_style="blue"))
 
     @override
     def print(self, message: str, color: str = "blue", bold: bool = False):
         """Print a message to the console."""
-        if self.app and self.app.execution_log:
-            formatted_message = f"[bold]{message}[/bold]" if bold else message
-            formatted_message = f"[{color}]{formatted_message}[/{color}]"
-            _ = self.app.execution_log.write(formatted_message)
+        if self.app:
+            self.app.queue_write(format_message(message, color, bold))
 
     @override
-    def get_task_input(self) -> str | None:
+    async def get_task_input(self) -> str | None:
         """Get task input from user (for interactive mode)."""
         # This method is not used in rich console as input is handled by the TUI
         return None
 
     @override
-    def get_working_dir_input(self) -> str:
+    async def get_working_dir_input(self) -> str:
         """Get working directory input from user (for interactive mode)."""
         # For now, return current directory. Could be enhanced with a dialog
-        return os.getcwd()
+        return self.cwd
 
     @override
     def stop(self):
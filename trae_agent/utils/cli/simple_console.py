@@ -4,9 +4,14 @@
 """Simple CLI Console implementation."""
 
 import asyncio
+import contextlib
+import os
+import re
+import sys
+import threading
 from typing import override
 
-from rich.console import Console
+from rich.console import Console, RenderableType
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
@@ -17,14 +22,80 @@ from trae_agent.utils.cli.cli_console import (
     CLIConsole,
     ConsoleMode,
     ConsoleStep,
+    format_message,
     generate_agent_step_table,
 )
 from trae_agent.utils.config import LakeviewConfig
 
+_EXIT_COMMAND_RE = re.compile(r"exit|quit", re.IGNORECASE)
+
+
+def _tool_call_arguments_size(agent_step: AgentStep) -> int:
+    """Return the combined length of the step's tool call arguments as displayed."""
+    return sum(len(str(tool_call.arguments)) for tool_call in agent_step.tool_calls or ())
+
+
+def _read_stdin_line() -> str:
+    """Read one line from stdin, raising EOFError at end of input like input() does."""
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        # stdin has been replaced by an in-memory stream
+        return input()
+
+    # Unbuffered reads from the descriptor never hold sys.stdin's buffer lock, which a
+    # daemon thread still blocked in input() would keep at interpreter shutdown
+    line = bytearray()
+    while not line.endswith(b"\n"):
+        chunk = os.read(fd, 1)
+        if not chunk:
+            if not line:
+                raise EOFError
+            break
+        line += chunk
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r\n")
+
+
+async def _read_line() -> str:
+    """Read a line from stdin without blocking the event loop.
+
+    The read runs on a daemon thread rather than the default executor: if the loop is torn
+    down (e.g. on Ctrl-C) while the user is still typing, asyncio.run would otherwise wait
+    for the pending read before exiting.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def resolve(line: str, error: Exception | None) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(line)
+
+    def read() -> None:
+        try:
+            line, error = _read_stdin_line(), None
+        except Exception as exc:
+            line, error = "", exc
+        # The loop may already be closed if the session ended while waiting for input
+        with contextlib.suppress(RuntimeError):
+            _ = loop.call_soon_threadsafe(resolve, line, error)
+
+    threading.Thread(target=read, name="trae-agent-input", daemon=True).start()
+    return await future
+
 
 class SimpleCLIConsole(CLIConsole):
     """Simple text-based CLI console that prints agent execution trace."""
 
+    # Final results longer than this many characters are parsed in a worker thread
+    MARKDOWN_THREAD_THRESHOLD: int = 8192
+
+    # Steps whose tool call arguments exceed this many characters are printed in a worker thread
+    STEP_THREAD_THRESHOLD: int = 4096
+
     def __init__(
         self, mode: ConsoleMode = ConsoleMode.RUN, lakeview_config: LakeviewConfig | None = None
     ):
@@ -36,6 +107,10 @@ class SimpleCLIConsole(CLIConsole):
         """
         super().__init__(mode, lakeview_config)
         self.console: Console = Console()
+        # Set while the latest execution has finished, so start() can wake immediately
+        self._done_event: asyncio.Event = asyncio.Event()
+        # Tail of the step prints handed to worker threads; later steps print after it
+        self._step_print_task: asyncio.Task[None] | None = None
 
     @override
     def update_status(
@@ -43,40 +118,39 @@ class SimpleCLIConsole(CLIConsole):
     ):
         """Update the console status with new agent step or execution info."""
         if agent_step:
-            if agent_step.step_number not in self.console_step_history:
+            console_step = self.console_step_history.get(agent_step.step_number)
+            if console_step is None:
                 # update step history
-                self.console_step_history[agent_step.step_number] = ConsoleStep(agent_step)
+                console_step = ConsoleStep(agent_step)
+                self.console_step_history[agent_step.step_number] = console_step
 
-            if (
-                agent_step.state in [AgentStepState.COMPLETED, AgentStepState.ERROR]
-                and not self.console_step_history[agent_step.step_number].agent_step_printed
+            # Steps that have already been printed need no further work
+            if not console_step.agent_step_printed and agent_step.state in (
+                AgentStepState.COMPLETED,
+                AgentStepState.ERROR,
             ):
-                self._print_step_update(agent_step, agent_execution)
-                self.console_step_history[agent_step.step_number].agent_step_printed = True
+                self._print_step_update(console_step, agent_execution)
+                console_step.agent_step_printed = True
 
                 # If lakeview is enabled, generate lakeview panel in the background
-                if (
-                    self.lake_view
-                    and not self.console_step_history[
-                        agent_step.step_number
-                    ].lake_view_panel_generator
-                ):
-                    self.console_step_history[
-                        agent_step.step_number
-                    ].lake_view_panel_generator = asyncio.create_task(
+                if self.lake_view and not console_step.lake_view_panel_generator:
+                    console_step.lake_view_panel_generator = asyncio.create_task(
                         self._create_lakeview_step_display(agent_step)
                     )
 
         self.agent_execution = agent_execution
+        if agent_execution:
+            if agent_execution.agent_state in (AgentState.COMPLETED, AgentState.ERROR):
+                self._done_event.set()
+            else:
+                self._done_event.clear()
 
     @override
     async def start(self):
         """Start the console - wait for completion and then print summary."""
-        while self.agent_execution is None or (
-            self.agent_execution.agent_state != AgentState.COMPLETED
-            and self.agent_execution.agent_state != AgentState.ERROR
-        ):
-            await asyncio.sleep(1)
+        _ = await self._done_event.wait()
+        if self._step_print_task:
+            await self._step_print_task
 
         # Print lakeview summary if enabled
         if self.lake_view and self.agent_execution:
@@ -84,13 +158,39 @@ class SimpleCLIConsole(CLIConsole):
 
         # Print execution summary
         if self.agent_execution:
-            self._print_execution_summary()
+            await self._print_execution_summary()
 
     def _print_step_update(
-        self, agent_step: AgentStep, agent_execution: AgentExecution | None = None
+        self, console_step: ConsoleStep, agent_execution: AgentExecution | None = None
     ):
         """Print a step update as it progresses."""
+        renderable = self._build_step_table(console_step.agent_step, agent_execution)
+        # Measuring and wrapping large tool arguments can stall the event loop, so such steps are
+        # printed in a worker thread, and any step queued behind one waits its turn
+        offload = _tool_call_arguments_size(console_step.agent_step) > self.STEP_THREAD_THRESHOLD
+        pending = self._step_print_task
+        if pending and pending.done():
+            pending = None
+        if not offload and not pending:
+            self.console.print(renderable)
+            return
+        self._step_print_task = asyncio.create_task(self._print_after(pending, renderable, offload))
 
+    async def _print_after(
+        self, pending: asyncio.Task[None] | None, renderable: RenderableType, offload: bool
+    ):
+        """Print a renderable once the previously queued step print has finished."""
+        if pending:
+            await pending
+        if offload:
+            await asyncio.to_thread(self.console.print, renderable)
+        else:
+            self.console.print(renderable)
+
+    def _build_step_table(
+        self, agent_step: AgentStep, agent_execution: AgentExecution | None = None
+    ) -> Table:
+        """Build the step table along with its token usage rows."""
         table = generate_agent_step_table(agent_step)
 
         if agent_step.llm_usage:
@@ -105,72 +205,64 @@ class SimpleCLIConsole(CLIConsole):
                 f"Input: {agent_execution.total_tokens.input_tokens} Output: {agent_execution.total_tokens.output_tokens}",
             )
 
-        self.console.print(table)
+        return table
 
     async def _print_lakeview_summary(self):
         """Print lakeview summary of all completed steps."""
-        self.console.print("\n" + "=" * 60)
-        self.console.print("[bold cyan]Lakeview Summary[/bold cyan]")
-        self.console.print("=" * 60)
-
-        for step in self.console_step_history.values():
-            if step.lake_view_panel_generator:
-                lake_view_panel = await step.lake_view_panel_generator
-                if lake_view_panel:
+        lake_view_panels = await asyncio.gather(
+            *(
+                step.lake_view_panel_generator
+                for step in self.console_step_history.values()
+                if step.lake_view_panel_generator
+            ),
+            return_exceptions=True,
+        )
+
+        # Buffer the whole summary so it reaches the terminal in a single write
+        with self.console:
+            self.console.print("\n" + "=" * 60)
+            self.console.print("[bold cyan]Lakeview Summary[/bold cyan]")
+            self.console.print("=" * 60)
+            for lake_view_panel in lake_view_panels:
+                # A failed summary for one step should not hide the others
+                if isinstance(lake_view_panel, Panel):
                     self.console.print(lake_view_panel)
 
-    def _print_execution_summary(self):
+    async def _print_execution_summary(self):
         """Print the final execution summary."""
         if not self.agent_execution:
             return
 
-        self.console.print("\n" + "=" * 60)
-        self.console.print("[bold green]Execution Summary[/bold green]")
-        self.console.print("=" * 60)
-
-        # Create summary table
-        table = Table(show_header=False, width=60)
-        table.add_column("Metric", style="cyan", width=20)
-        table.add_column("Value", style="green", width=40)
-
-        table.add_row(
-            "Task",
-            self.agent_execution.task[:50] + "..."
-            if len(self.agent_execution.task) > 50
-            else self.agent_execution.task,
-        )
-        table.add_row("Success", "✅ Yes" if self.agent_execution.success else "❌ No")
-        table.add_row("Steps", str(len(self.agent_execution.steps)))
-        table.add_row("Execution Time", f"{self.agent_execution.execution_time:.2f}s")
-
-        if self.agent_execution.total_tokens:
-            total_tokens = (
-                self.agent_execution.total_tokens.input_tokens
-                + self.agent_execution.total_tokens.output_tokens
-            )
-            table.add_row("Total Tokens", str(total_tokens))
-            table.add_row("Input Tokens", str(self.agent_execution.total_tokens.input_tokens))
-            table.add_row("Output Tokens", str(self.agent_execution.total_tokens.output_tokens))
-
-        self.console.print(table)
-
-        # Display final result
-        if self.agent_execution.final_result:
-            self.console.print(
-                Panel(
-                    Markdown(self.agent_execution.final_result),
-                    title="Final Result",
-                    border_style="green" if self.agent_execution.success else "red",
+        final_result = self.agent_execution.final_result
+        markdown: Markdown | None = None
+        if final_result:
+            # Parsing a large result can take a while, so keep it off the event loop
+            if len(final_result) > self.MARKDOWN_THREAD_THRESHOLD:
+                markdown = await asyncio.to_thread(Markdown, final_result)
+            else:
+                markdown = Markdown(final_result)
+
+        # Buffer the whole summary so it reaches the terminal in a single write
+        with self.console:
+            self.console.print("\n" + "=" * 60)
+            self.console.print("[bold green]Execution Summary[/bold green]")
+            self.console.print("=" * 60)
+            self.console.print(_build_summary_table(self.agent_execution))
+
+            # Display final result
+            if markdown:
+                self.console.print(
+                    Panel(
+                        markdown,
+                        title="Final Result",
+                        border_style="green" if self.agent_execution.success else "red",
+                    )
                 )
-            )
 
     @override
     def print_task_details(self, details: dict[str, str]):
         """Print initial task configuration details."""
-        renderable = ""
-        for key, value in details.items():
-            renderable += f"[bold]{key}:[/bold] {value}\n"
-        renderable = renderable.strip()
+        renderable = "\n".join(f"[bold]{key}:[/bold] {value}" for key, value in details.items())
         self.console.print(
             Panel(
                 renderable,
@@ -182,34 +274,32 @@ class SimpleCLIConsole(CLIConsole):
     @override
     def print(self, message: str, color: str = "blue", bold: bool = False):
         """Print a message to the console."""
-        message = f"[bold]{message}[/bold]" if bold else message
-        message = f"[{color}]{message}[/{color}]"
-        self.console.print(message)
+        self.console.print(format_message(message, color, bold))
 
     @override
-    def get_task_input(self) -> str | None:
+    async def get_task_input(self) -> str | None:
         """Get task input from user (for interactive mode)."""
         if self.mode != ConsoleMode.INTERACTIVE:
             return None
 
         self.console.print("\n[bold blue]Task:[/bold blue] ", end="")
         try:
-            task = input()
-            if task.lower() in ["exit", "quit"]:
+            task = await _read_line()
+            if _EXIT_COMMAND_RE.fullmatch(task):
                 return None
             return task
         except (EOFError, KeyboardInterrupt):
             return None
 
     @override
-    def get_working_dir_input(self) -> str:
+    async def get_working_dir_input(self) -> str:
         """Get working directory input from user (for interactive mode)."""
         if self.mode != ConsoleMode.INTERACTIVE:
             return ""
 
         self.console.print("[bold blue]Working Directory:[/bold blue] ", end="")
         try:
-            return input()
+            return await _read_line()
         except (EOFError, KeyboardInterrupt):
             return ""
 
@@ -224,12 +314,13 @@ class SimpleCLIConsole(CLIConsole):
         if self.lake_view is None:
             return None
 
-        lake_view_step = await self.lake_view.create_lakeview_step(agent_step)
+        async with self._lakeview_semaphore:
+            lake_view_step = await self.lake_view.create_lakeview_step(agent_step)
 
         if lake_view_step is None:
             return None
 
-        color, _ = AGENT_STATE_INFO.get(agent_step.state, ("white", "❓"))
+        color, _ = AGENT_STATE_INFO[agent_step.state]
 
         return Panel(
             f"""[{lake_view_step.tags_emoji}] The agent [bold]{lake_view_step.desc_task}[/bold]
@@ -238,3 +329,32 @@ class SimpleCLIConsole(CLIConsole):
             border_style=color,
             width=80,
         )
+
+
+def _build_summary_table(agent_execution: AgentExecution) -> Table:
+    """Create the execution summary table."""
+    task = agent_execution.task
+    rows = [
+        ("Task", task[:50] + "..." if len(task) > 50 else task),
+        ("Success", "✅ Yes" if agent_execution.success else "❌ No"),
+        ("Steps", str(len(agent_execution.steps))),
+        ("Execution Time", f"{agent_execution.execution_time:.2f}s"),
+    ]
+
+    if agent_execution.total_tokens:
+        input_tokens = agent_execution.total_tokens.input_tokens
+        output_tokens = agent_execution.total_tokens.output_tokens
+        rows.extend(
+            (
+                ("Total Tokens", str(input_tokens + output_tokens)),
+                ("Input Tokens", str(input_tokens)),
+                ("Output Tokens", str(output_tokens)),
+            )
+        )
+
+    table = Table(show_header=False, width=60)
+    table.add_column("Metric", style="cyan", width=20)
+    table.add_column("Value", style="green", width=40)
+    for metric, value in rows:
+        table.add_row(metric, value)
+    return table
@@ -1,32 +1,114 @@
 # Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import copy
 import os
-from dataclasses import dataclass, field
+import runpy
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-import yaml
+# yaml and the legacy config are imported where they are used, so importing this module stays
+# cheap for callers that build configs programmatically
+if TYPE_CHECKING:
+    from trae_agent.utils.legacy_config import LegacyConfig
 
-from trae_agent.utils.legacy_config import LegacyConfig
+# Parsed YAML files, so re-creating a Config from an unchanged file skips the parse. Files are
+# keyed by path and stamped with (st_mtime_ns, st_size).
+_YAML_FILE_CACHE: dict[str, tuple[int, int, Any]] = {}
+
+
+def _yaml_load(stream: Any) -> Any:
+    import yaml
+
+    try:
+        # Prefer libyaml's C loader when PyYAML was built with it; it accepts the same documents
+        return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    except yaml.YAMLError as e:
+        raise ConfigError(f"Error parsing YAML config: {e}") from e
+
+
+def _load_yaml_file(config_file: str) -> Any:
+    stat = os.stat(config_file)
+    cached = _YAML_FILE_CACHE.get(config_file)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        # Read as bytes so the YAML loader detects the encoding (UTF-8 unless there is a BOM)
+        # instead of decoding with the platform's locale encoding
+        with open(config_file, "rb") as f:
+            cached = (stat.st_mtime_ns, stat.st_size, _yaml_load(f))
+        _YAML_FILE_CACHE[config_file] = cached
+    # Callers get their own copy so nothing they do can leak into the cache
+    return copy.deepcopy(cached[2])
+
+
+# Bounded, as a long-running process may build configs from many generated strings
+@lru_cache(maxsize=16)
+def _parse_yaml_string(config_string: str) -> Any:
+    return _yaml_load(config_string)
+
+
+def _load_yaml_string(config_string: str) -> Any:
+    # Callers get their own copy so nothing they do can leak into the cache
+    return copy.deepcopy(_parse_yaml_string(config_string))
+
+
+def _load_python_config(config_file: str) -> Any:
+    """Load a config precompiled by tools/precompile_config.py, skipping YAML parsing."""
+    try:
+        return runpy.run_path(config_file)["CONFIG"]
+    except KeyError as e:
+        raise ConfigError(f"{config_file} does not define CONFIG") from e
 
 
 class ConfigError(Exception):
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelProvider:
     """
     Model provider configuration. For official model providers such as OpenAI and Anthropic,
     the base_url is optional. api_version is required for Azure.
+
+    Providers are immutable and shared between models; use dataclasses.replace to derive one.
     """
 
     api_key: str
     provider: str
     base_url: str | None = None
     api_version: str | None = None
+    # Prefix of the provider's environment variables, e.g. OPENAI for OPENAI_API_KEY
+    provider_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "provider_upper", str(self.provider).upper())
+
+
+# Bounded, as the keys hold API keys and a long-running process may resolve many of them
+@lru_cache(maxsize=32)
+def _interned_provider(
+    api_key: str, provider: str, base_url: str | None, api_version: str | None
+) -> ModelProvider:
+    return ModelProvider(
+        api_key=api_key, provider=provider, base_url=base_url, api_version=api_version
+    )
 
 
-@dataclass
+def _make_provider(
+    api_key: str, provider: str, base_url: str | None = None, api_version: str | None = None
+) -> ModelProvider:
+    """Return a shared ModelProvider for these values, or a new one if they cannot be hashed."""
+    try:
+        return _interned_provider(api_key, provider, base_url, api_version)
+    except TypeError:
+        # e.g. a list where the YAML config should hold a string
+        return ModelProvider(
+            api_key=api_key, provider=provider, base_url=base_url, api_version=api_version
+        )
+
+
+@dataclass(slots=True)
 class ModelConfig:
     """
     Model configuration.
@@ -43,6 +125,13 @@ class ModelConfig:
     supports_tool_calling: bool = True
     candidate_count: int | None = None  # Gemini specific field
     stop_sequences: list[str] | None = None
+    # Client-side quota for concurrent async requests; None leaves it unlimited
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    # Replay responses to exactly repeated requests from disk; only used at temperature 0
+    cache_responses: bool = False
+    # Similarity above which a paraphrased one-shot prompt reuses an earlier response
+    semantic_cache_threshold: float | None = None
 
     def resolve_config_values(
         self,
@@ -68,36 +157,49 @@ class ModelConfig:
             elif api_key is None:
                 raise ConfigError("To register a new model provider, an api_key should be provided")
             else:
-                self.model_provider = ModelProvider(
+                self.model_provider = _make_provider(
                     api_key=api_key,
                     provider=provider,
                     base_url=model_base_url,
                 )
 
         # Map providers to their environment variable names
-        env_var_api_key = str(self.model_provider.provider).upper() + "_API_KEY"
-        env_var_api_base_url = str(self.model_provider.provider).upper() + "_BASE_URL"
+        env = os.environ
+        provider_upper = self.model_provider.provider_upper
+        env_var_api_key = f"{provider_upper}_API_KEY"
+        env_var_api_base_url = f"{provider_upper}_BASE_URL"
 
         resolved_api_key = resolve_config_value(
             cli_value=api_key,
             config_value=self.model_provider.api_key,
             env_var=env_var_api_key,
+            env=env,
         )
 
         resolved_api_base_url = resolve_config_value(
             cli_value=model_base_url,
             config_value=self.model_provider.base_url,
             env_var=env_var_api_base_url,
+            env=env,
         )
 
-        if resolved_api_key:
-            self.model_provider.api_key = str(resolved_api_key)
+        base_provider = self.model_provider
+        self.model_provider = replace(
+            base_provider,
+            api_key=str(resolved_api_key) if resolved_api_key else base_provider.api_key,
+            base_url=str(resolved_api_base_url)
+            if resolved_api_base_url
+            else base_provider.base_url,
+        )
 
-        if resolved_api_base_url:
-            self.model_provider.base_url = str(resolved_api_base_url)
+        # Registered providers are shared by name, so the resolved values apply to them too
+        if model_providers:
+            for name, registered_provider in model_providers.items():
+                if registered_provider is base_provider:
+                    model_providers[name] = self.model_provider
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPServerConfig:
     # For stdio transport
     command: str | None = None
@@ -123,7 +225,7 @@ class MCPServerConfig:
     description: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """
     Base class for agent configurations.
@@ -136,7 +238,7 @@ class AgentConfig:
     tools: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class TraeAgentConfig(AgentConfig):
     """
     Trae agent configuration.
@@ -162,7 +264,7 @@ class TraeAgentConfig(AgentConfig):
             self.max_steps = int(resolved_value)
 
 
-@dataclass
+@dataclass(slots=True)
 class LakeviewConfig:
     """
     Lakeview configuration.
@@ -171,7 +273,7 @@ class LakeviewConfig:
     model: ModelConfig
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """
     Configuration class for agents, models and model providers.
@@ -183,6 +285,11 @@ class Config:
 
     trae_agent: TraeAgentConfig | None = None
 
+    def __post_init__(self):
+        # Checked here so every way of building a Config enforces it
+        if self.trae_agent and self.trae_agent.enable_lakeview and self.lakeview is None:
+            raise ConfigError("Lakeview is enabled but no lakeview config provided")
+
     @classmethod
     def create(
         cls,
@@ -194,91 +301,92 @@ class Config:
             raise ConfigError("Only one of config_file or config_string should be provided")
 
         # Parse YAML config from file or string
-        try:
-            if config_file is not None:
-                if config_file.endswith(".json"):
-                    return cls.create_from_legacy_config(config_file=config_file)
-                with open(config_file, "r") as f:
-                    yaml_config = yaml.safe_load(f)
-            elif config_string is not None:
-                yaml_config = yaml.safe_load(config_string)
+        if config_file is not None:
+            if config_file.endswith(".json"):
+                return cls.create_from_legacy_config(config_file=config_file)
+            if config_file.endswith(".py"):
+                yaml_config = _load_python_config(config_file)
             else:
-                raise ConfigError("No config file or config string provided")
-        except yaml.YAMLError as e:
-            raise ConfigError(f"Error parsing YAML config: {e}") from e
-
-        config = cls()
+                yaml_config = _load_yaml_file(config_file)
+        elif config_string is not None:
+            yaml_config = _load_yaml_string(config_string)
+        else:
+            raise ConfigError("No config file or config string provided")
+
+        # Take every top-level section in one pass and report all missing ones together
+        model_providers = yaml_config.pop("model_providers", None)
+        models = yaml_config.pop("models", None)
+        lakeview = yaml_config.pop("lakeview", None)
+        mcp_servers = yaml_config.pop("mcp_servers", None) or {}
+        allow_mcp_servers = yaml_config.pop("allow_mcp_servers", None) or []
+        agents = yaml_config.pop("agents", None)
+
+        missing_sections = [
+            message
+            for section, message in (
+                (model_providers, "No model providers provided"),
+                (models, "No models provided"),
+                (agents, "No agent configs provided"),
+            )
+            if not section
+        ]
+        if missing_sections:
+            raise ConfigError("; ".join(missing_sections))
 
         # Parse model providers
-        model_providers = yaml_config.get("model_providers", None)
-        if model_providers is not None and len(model_providers.keys()) > 0:
-            config_model_providers: dict[str, ModelProvider] = {}
-            for model_provider_name, model_provider_config in model_providers.items():
-                config_model_providers[model_provider_name] = ModelProvider(**model_provider_config)
-            config.model_providers = config_model_providers
-        else:
-            raise ConfigError("No model providers provided")
+        config_model_providers: dict[str, ModelProvider] = {}
+        for model_provider_name, model_provider_config in model_providers.items():
+            config_model_providers[model_provider_name] = _make_provider(**model_provider_config)
 
         # Parse models and populate model_provider fields
-        models = yaml_config.get("models", None)
-        if models is not None and len(models.keys()) > 0:
-            config_models: dict[str, ModelConfig] = {}
-            for model_name, model_config in models.items():
-                if model_config["model_provider"] not in config_model_providers:
-                    raise ConfigError(f"Model provider {model_config['model_provider']} not found")
-                config_models[model_name] = ModelConfig(**model_config)
-                config_models[model_name].model_provider = config_model_providers[
-                    model_config["model_provider"]
-                ]
-            config.models = config_models
-        else:
-            raise ConfigError("No models provided")
+        config_models: dict[str, ModelConfig] = {}
+        for model_name, model_config in models.items():
+            provider_name = model_config.pop("model_provider")
+            model_provider = config_model_providers.get(provider_name)
+            if model_provider is None:
+                raise ConfigError(f"Model provider {provider_name} not found")
+            config_models[model_name] = ModelConfig(**model_config, model_provider=model_provider)
 
         # Parse lakeview config
-        lakeview = yaml_config.get("lakeview", None)
+        lakeview_config: LakeviewConfig | None = None
         if lakeview is not None:
             lakeview_model_name = lakeview.get("model", None)
             if lakeview_model_name is None:
                 raise ConfigError("No model provided for lakeview")
             lakeview_model = config_models[lakeview_model_name]
-            config.lakeview = LakeviewConfig(
+            lakeview_config = LakeviewConfig(
                 model=lakeview_model,
             )
-        else:
-            config.lakeview = None
 
-        mcp_servers_config = {
-            k: MCPServerConfig(**v) for k, v in yaml_config.get("mcp_servers", {}).items()
-        }
-        allow_mcp_servers = yaml_config.get("allow_mcp_servers", [])
+        mcp_servers_config = {k: MCPServerConfig(**v) for k, v in mcp_servers.items()}
 
         # Parse agents
-        agents = yaml_config.get("agents", None)
-        if agents is not None and len(agents.keys()) > 0:
-            for agent_name, agent_config in agents.items():
-                agent_model_name = agent_config.get("model", None)
-                if agent_model_name is None:
-                    raise ConfigError(f"No model provided for {agent_name}")
-                try:
-                    agent_model = config_models[agent_model_name]
-                except KeyError as e:
-                    raise ConfigError(f"Model {agent_model_name} not found") from e
-                match agent_name:
-                    case "trae_agent":
-                        trae_agent_config = TraeAgentConfig(
-                            **agent_config,
-                            mcp_servers_config=mcp_servers_config,
-                            allow_mcp_servers=allow_mcp_servers,
-                        )
-                        trae_agent_config.model = agent_model
-                        if trae_agent_config.enable_lakeview and config.lakeview is None:
-                            raise ConfigError("Lakeview is enabled but no lakeview config provided")
-                        config.trae_agent = trae_agent_config
-                    case _:
-                        raise ConfigError(f"Unknown agent: {agent_name}")
-        else:
-            raise ConfigError("No agent configs provided")
-        return config
+        trae_agent_config: TraeAgentConfig | None = None
+        for agent_name, agent_config in agents.items():
+            agent_model_name = agent_config.get("model", None)
+            if agent_model_name is None:
+                raise ConfigError(f"No model provided for {agent_name}")
+            try:
+                agent_model = config_models[agent_model_name]
+            except KeyError as e:
+                raise ConfigError(f"Model {agent_model_name} not found") from e
+            match agent_name:
+                case "trae_agent":
+                    trae_agent_config = TraeAgentConfig(
+                        **agent_config,
+                        mcp_servers_config=mcp_servers_config,
+                        allow_mcp_servers=allow_mcp_servers,
+                    )
+                    trae_agent_config.model = agent_model
+                case _:
+                    raise ConfigError(f"Unknown agent: {agent_name}")
+
+        return cls(
+            lakeview=lakeview_config,
+            model_providers=config_model_providers,
+            models=config_models,
+            trae_agent=trae_agent_config,
+        )
 
     def resolve_config_values(
         self,
@@ -293,6 +401,7 @@ class Config:
             self.trae_agent.resolve_config_values(
                 max_steps=max_steps,
             )
+            previous_providers = dict(self.model_providers or {})
             self.trae_agent.model.resolve_config_values(
                 model_providers=self.model_providers,
                 provider=provider,
@@ -300,51 +409,67 @@ class Config:
                 model_base_url=model_base_url,
                 api_key=api_key,
             )
+            self._share_resolved_providers(previous_providers)
         return self
 
+    def _share_resolved_providers(self, previous_providers: dict[str, ModelProvider]) -> None:
+        """Point every model at the resolved copy of any provider that resolution replaced."""
+        replaced = {
+            id(previous_providers[name]): model_provider
+            for name, model_provider in (self.model_providers or {}).items()
+            if name in previous_providers and model_provider is not previous_providers[name]
+        }
+        if not replaced:
+            return
+        model_configs = list((self.models or {}).values())
+        if self.lakeview:
+            model_configs.append(self.lakeview.model)
+        for model_config in model_configs:
+            model_config.model_provider = replaced.get(
+                id(model_config.model_provider), model_config.model_provider
+            )
+
     @classmethod
     def create_from_legacy_config(
         cls,
         *,
-        legacy_config: LegacyConfig | None = None,
+        legacy_config: "LegacyConfig | None" = None,
         config_file: str | None = None,
     ) -> "Config":
         if legacy_config and config_file:
             raise ConfigError("Only one of legacy_config or config_file should be provided")
 
+        from trae_agent.utils.legacy_config import LegacyConfig
+
         if config_file:
             legacy_config = LegacyConfig(config_file)
         elif not legacy_config:
             raise ConfigError("No legacy_config or config_file provided")
 
-        model_provider = ModelProvider(
-            api_key=legacy_config.model_providers[legacy_config.default_provider].api_key,
-            base_url=legacy_config.model_providers[legacy_config.default_provider].base_url,
-            api_version=legacy_config.model_providers[legacy_config.default_provider].api_version,
-            provider=legacy_config.default_provider,
+        default_provider = legacy_config.default_provider
+        model_parameters = legacy_config.model_providers[default_provider]
+
+        model_provider = _make_provider(
+            api_key=model_parameters.api_key,
+            base_url=model_parameters.base_url,
+            api_version=model_parameters.api_version,
+            provider=default_provider,
         )
 
         model_config = ModelConfig(
-            model=legacy_config.model_providers[legacy_config.default_provider].model,
+            model=model_parameters.model,
             model_provider=model_provider,
-            max_tokens=legacy_config.model_providers[legacy_config.default_provider].max_tokens,
-            temperature=legacy_config.model_providers[legacy_config.default_provider].temperature,
-            top_p=legacy_config.model_providers[legacy_config.default_provider].top_p,
-            top_k=legacy_config.model_providers[legacy_config.default_provider].top_k,
-            parallel_tool_calls=legacy_config.model_providers[
-                legacy_config.default_provider
-            ].parallel_tool_calls,
-            max_retries=legacy_config.model_providers[legacy_config.default_provider].max_retries,
-            candidate_count=legacy_config.model_providers[
-                legacy_config.default_provider
-            ].candidate_count,
-            stop_sequences=legacy_config.model_providers[
-                legacy_config.default_provider
-            ].stop_sequences,
+            max_tokens=model_parameters.max_tokens,
+            temperature=model_parameters.temperature,
+            top_p=model_parameters.top_p,
+            top_k=model_parameters.top_k,
+            parallel_tool_calls=model_parameters.parallel_tool_calls,
+            max_retries=model_parameters.max_retries,
+            candidate_count=model_parameters.candidate_count,
+            stop_sequences=model_parameters.stop_sequences,
         )
-        mcp_servers_config = {
-            k: MCPServerConfig(**vars(v)) for k, v in legacy_config.mcp_servers.items()
-        }
+        # Legacy configs share the MCPServerConfig class, so the servers need no conversion
+        mcp_servers_config = dict(legacy_config.mcp_servers)
         trae_agent_config = TraeAgentConfig(
             max_steps=legacy_config.max_steps,
             enable_lakeview=legacy_config.enable_lakeview,
@@ -364,7 +489,7 @@ class Config:
             trae_agent=trae_agent_config,
             lakeview=lakeview_config,
             model_providers={
-                legacy_config.default_provider: model_provider,
+                default_provider: model_provider,
             },
             models={
                 "default_model": model_config,
@@ -377,13 +502,19 @@ def resolve_config_value(
     cli_value: int | str | float | None,
     config_value: int | str | float | None,
     env_var: str | None = None,
+    env: Mapping[str, str] | None = None,
 ) -> int | str | float | None:
-    """Resolve configuration value with priority: CLI > ENV > Config > Default."""
+    """Resolve configuration value with priority: CLI > ENV > Config > Default.
+
+    ``env`` defaults to ``os.environ``; callers resolving several values can pass it in once.
+    """
     if cli_value is not None:
         return cli_value
 
-    if env_var and os.getenv(env_var):
-        return os.getenv(env_var)
+    if env_var:
+        env_value = (os.environ if env is None else env).get(env_var)
+        if env_value:
+            return env_value
 
     if config_value is not None:
         return config_value
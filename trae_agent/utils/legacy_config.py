@@ -9,13 +9,22 @@
 # pyright: reportUnknownVariableType=false
 
 import json
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, override
 
+# The MCP server schema is the same in both config formats, so the class is shared
+from trae_agent.utils.config import MCPServerConfig
+
+# orjson parses bytes faster than the standard library; use it when it happens to be installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # data class for model parameters
-@dataclass
+@dataclass(slots=True)
 class ModelParameters:
     """Model parameters for a model provider."""
 
@@ -33,7 +42,7 @@ class ModelParameters:
     stop_sequences: list[str] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LakeviewConfig:
     """Configuration for Lakeview."""
 
@@ -41,43 +50,28 @@ class LakeviewConfig:
     model_name: str
 
 
-@dataclass
-class MCPServerConfig:
-    # For stdio transport
-    command: str | None = None
-    args: list[str] | None = None
-    env: dict[str, str] | None = None
-    cwd: str | None = None
-
-    # For sse transport
-    url: str | None = None
-
-    # For streamable http transport
-    http_url: str | None = None
-    headers: dict[str, str] | None = None
-
-    # For websocket transport
-    tcp: str | None = None
-
-    # Common
-    timeout: int | None = None
-    trust: bool | None = None
-
-    # Metadata
-    description: str | None = None
-
-
-@dataclass
 class LegacyConfig:
     """Configuration manager for Trae Agent."""
 
+    # Not a dataclass since __init__ is hand-written; slots are declared directly instead
+    __slots__ = (
+        "_config",
+        "default_provider",
+        "max_steps",
+        "model_providers",
+        "mcp_servers",
+        "lakeview_config",
+        "enable_lakeview",
+        "allow_mcp_servers",
+    )
+
     default_provider: str
     max_steps: int
     model_providers: dict[str, ModelParameters]
     mcp_servers: dict[str, MCPServerConfig]
-    lakeview_config: LakeviewConfig | None = None
-    enable_lakeview: bool = True
-    allow_mcp_servers: list[str] = field(default_factory=list)
+    lakeview_config: LakeviewConfig | None
+    enable_lakeview: bool
+    allow_mcp_servers: list[str]
 
     def __init__(self, config_or_config_file: str | dict = "trae_config.json"):  # pyright: ignore[reportMissingTypeArgument, reportUnknownParameterType]
         # Accept either file path or direct config dict
@@ -87,8 +81,8 @@ class LegacyConfig:
             config_path = Path(config_or_config_file)
             if config_path.exists():
                 try:
-                    with open(config_path, "r") as f:
-                        self._config = json.load(f)
+                    # Both parsers decode UTF-8 bytes directly, skipping a text-mode file wrapper
+                    self._config = _json_loads(config_path.read_bytes())
                 except Exception as e:
                     print(f"Warning: Could not load config file {config_or_config_file}: {e}")
                     self._config = {}
@@ -103,6 +97,7 @@ class LegacyConfig:
             k: MCPServerConfig(**v) for k, v in self._config.get("mcp_servers", {}).items()
         }
         self.allow_mcp_servers = self._config.get("allow_mcp_servers", [])
+        self.lakeview_config = None
 
         if len(self._config.get("model_providers", [])) == 0:
             self.model_providers = {
@@ -119,31 +114,26 @@ class LegacyConfig:
                 ),
             }
         else:
-            for provider in self._config.get("model_providers", {}):
-                provider_config: dict[str, Any] = self._config.get("model_providers", {}).get(
-                    provider, {}
-                )
-
+            model_providers_config: dict[str, dict[str, Any]] = self._config.get(
+                "model_providers", {}
+            )
+            for provider, provider_config in model_providers_config.items():
+                base_url = provider_config.get("base_url")
+                api_version = provider_config.get("api_version")
                 candidate_count = provider_config.get("candidate_count")
                 self.model_providers[provider] = ModelParameters(
                     model=str(provider_config.get("model", "")),
                     api_key=str(provider_config.get("api_key", "")),
-                    base_url=str(provider_config.get("base_url"))
-                    if "base_url" in provider_config
-                    else None,
+                    base_url=str(base_url) if base_url is not None else None,
                     max_tokens=int(provider_config.get("max_tokens", 1000)),
                     temperature=float(provider_config.get("temperature", 0.5)),
                     top_p=float(provider_config.get("top_p", 1)),
                     top_k=int(provider_config.get("top_k", 0)),
                     max_retries=int(provider_config.get("max_retries", 10)),
                     parallel_tool_calls=bool(provider_config.get("parallel_tool_calls", False)),
-                    api_version=str(provider_config.get("api_version"))
-                    if "api_version" in provider_config
-                    else None,
+                    api_version=str(api_version) if api_version is not None else None,
                     candidate_count=int(candidate_count) if candidate_count is not None else None,
-                    stop_sequences=provider_config.get("stop_sequences")
-                    if "stop_sequences" in provider_config
-                    else None,
+                    stop_sequences=provider_config.get("stop_sequences"),
                 )
 
         # Configure lakeview_config - default to using default_provider settings
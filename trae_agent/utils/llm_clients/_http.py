@@ -0,0 +1,30 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""HTTP transport shared by the OpenAI-compatible clients."""
+
+import importlib.util
+from functools import cache
+
+import httpx
+import openai
+
+
+@cache
+def shared_http_client() -> httpx.Client:
+    """Return the process-wide HTTP client, creating it on first use.
+
+    Every OpenAI-compatible client sends its requests through this pool, so successive calls
+    (and the Lakeview client next to the agent's own) reuse open connections instead of paying
+    for a new TCP and TLS handshake. HTTP/2 is used when the optional h2 package is installed.
+    """
+    return openai.DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=64,
+            keepalive_expiry=85.0,
+        ),
+        # Long generations can take minutes, so only the connect timeout is tightened
+        timeout=httpx.Timeout(600.0, connect=5.0),
+        http2=importlib.util.find_spec("h2") is not None,
+    )
@@ -0,0 +1,153 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""Client-side rate limiting for concurrent LLM requests."""
+
+import asyncio
+import re
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any
+
+from trae_agent.utils.config import ModelConfig
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens in a prompt, at about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def _parse_delay(value: str) -> float | None:
+    """Parse a Retry-After value or a reset duration such as "1m30s" into seconds."""
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_PART_RE.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def http_status(exc: BaseException) -> int | None:
+    """Return the HTTP status carried by a provider SDK exception, if any."""
+    for attribute in ("status_code", "code"):
+        value = getattr(exc, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return how long the provider asked us to wait before retrying a rate-limited request."""
+    if http_status(exc) != 429:
+        return None
+    response: Any = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    delays = [
+        delay
+        for name in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if (value := headers.get(name)) and (delay := _parse_delay(value)) is not None
+    ]
+    return max(delays, default=None)
+
+
+class AsyncTokenBucket:
+    """Keeps concurrent requests within a requests-per-minute and a tokens-per-minute quota.
+
+    Both buckets refill continuously. A limit of None leaves that dimension unlimited. The buckets
+    are only changed between awaits, so no lock is needed within one event loop.
+    """
+
+    def __init__(self, rpm: int | None = None, tpm: int | None = None):
+        self.rpm: int | None = rpm
+        self.tpm: int | None = tpm
+        self._requests: float = float(rpm or 0)
+        self._tokens: float = float(tpm or 0)
+        self._updated: float = time.monotonic()
+        self._blocked_until: float = 0.0
+
+    def _refill(self, now: float) -> None:
+        # Nothing accrues while requests are held back by block_for()
+        if now <= self._updated:
+            return
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60)
+
+    def _reserve(self, tokens: int) -> float:
+        """Take capacity for one request, or return how long to wait before it is available."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        # A request larger than the whole token quota only has to wait for a full bucket
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        wait = 0.0
+        if self.rpm and self._requests < 1:
+            wait = (1 - self._requests) * 60 / self.rpm
+        if self.tpm and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+        if wait == 0.0:
+            self._requests -= 1
+            self._tokens -= tokens
+        return wait
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every request for the given time and start again with empty buckets."""
+        self._refill(time.monotonic())
+        self._requests = self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._updated = self._blocked_until
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int) -> AsyncIterator[None]:
+        """Wait until a request of about this many tokens fits the quota, then make it.
+
+        If the request is rejected as rate limited, the delay the provider asks for is applied to
+        all requests sharing this bucket.
+        """
+        while (wait := self._reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+        try:
+            yield
+        except Exception as exc:
+            delay = retry_after_seconds(exc)
+            if delay:
+                self.block_for(delay)
+            raise
+
+
+@lru_cache(maxsize=None)
+def _shared_limiter(
+    provider: str, model: str, rpm: int | None, tpm: int | None
+) -> AsyncTokenBucket | None:
+    if rpm is None and tpm is None:
+        return None
+    return AsyncTokenBucket(rpm, tpm)
+
+
+def get_limiter(model_config: ModelConfig) -> AsyncTokenBucket | None:
+    """Return the limiter shared by all clients of this provider and model, if limits are set."""
+    return _shared_limiter(
+        model_config.model_provider.provider,
+        model_config.model,
+        model_config.requests_per_minute,
+        model_config.tokens_per_minute,
+    )
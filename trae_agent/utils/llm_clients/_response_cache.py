@@ -0,0 +1,125 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""On-disk cache of provider responses for exactly repeated deterministic requests."""
+
+import contextlib
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from trae_agent.utils.config import ModelConfig
+from trae_agent.utils.constants import LOCAL_STORAGE_PATH
+
+DEFAULT_CACHE_PATH = LOCAL_STORAGE_PATH / "response_cache.sqlite3"
+DEFAULT_SIZE_LIMIT = 1 << 30  # 1 GiB
+
+
+class ResponseCache:
+    """Least-recently-used store of raw provider responses, kept in SQLite.
+
+    Entries are JSON documents keyed by the digest of the request that produced them. Once the
+    stored documents exceed the size limit, the least recently used ones are dropped.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, size_limit: int = DEFAULT_SIZE_LIMIT):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.size_limit: int = size_limit
+        # Worker threads running chat() share the connection, one statement at a time
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            _ = self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "accessed REAL NOT NULL)"
+            )
+            _ = self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+    def get(self, key: str) -> Any | None:
+        """Return the stored response for this key, or None if there is none."""
+        try:
+            return self._get(key)
+        except sqlite3.Error:
+            # A broken cache only costs the request it would have saved
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serialisable response, evicting old entries beyond the size limit."""
+        with contextlib.suppress(sqlite3.Error):
+            self._set(key, json.dumps(value))
+
+    def _get(self, key: str) -> Any | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            _ = self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def _set(self, key: str, document: str) -> None:
+        with self._lock, self._connection:
+            _ = self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, document, len(document), time.time()),
+            )
+            (total,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            if total > self.size_limit:
+                self._evict(total - self.size_limit)
+
+    def _evict(self, excess: int) -> None:
+        freed = 0
+        stale_keys: list[str] = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            if freed >= excess:
+                break
+            stale_keys.append(key)
+            freed += size
+        _ = self._connection.executemany(
+            "DELETE FROM responses WHERE key = ?", [(key,) for key in stale_keys]
+        )
+
+
+@cache
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, opening it on first use."""
+    return ResponseCache()
+
+
+def is_cacheable(model_config: ModelConfig) -> bool:
+    """Whether responses for this model may be replayed from the cache.
+
+    Only models configured with cache_responses and a temperature of 0 are cached, since any
+    sampling would make a replayed answer differ from a fresh one.
+    """
+    return model_config.cache_responses and model_config.temperature == 0
+
+
+def response_cache_key(model_config: ModelConfig, request: dict[str, Any]) -> str:
+    """Digest of everything sent to the provider, given as a JSON-serialisable request."""
+    canonical = json.dumps(
+        {
+            "provider": model_config.model_provider.provider,
+            "model": model_config.model,
+            "request": request,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=32).hexdigest()
@@ -0,0 +1,144 @@
+# Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""Optional cache answering paraphrased one-shot prompts with earlier responses.
+
+The last user message is embedded locally with sentence-transformers and looked up in an hnswlib
+index. Both packages are optional: without them, or after any error, the cache stays out of the
+way and every request goes to the provider.
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from trae_agent.tools.base import Tool, ToolCall
+from trae_agent.utils.config import ModelConfig
+from trae_agent.utils.constants import LOCAL_STORAGE_PATH
+from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse, LLMUsage
+
+DEFAULT_CACHE_PATH = LOCAL_STORAGE_PATH / "semantic_cache.jsonl"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Neighbours examined per lookup; entries from other scopes are skipped among them
+_NEIGHBOURS = 8
+
+
+def semantic_cache_scope(
+    model_config: ModelConfig, messages: list[LLMMessage], tools: list[Tool] | None
+) -> tuple[str, str] | None:
+    """Split a request into the scope it must match exactly and the text that may be paraphrased.
+
+    Everything but the final user message, i.e. the model, tool schemas, system prompt and any
+    earlier turns, goes into the scope. None is returned if the request does not end in a plain
+    user message.
+    """
+    if not messages:
+        return None
+    last = messages[-1]
+    if last.role != "user" or not last.content or last.tool_call or last.tool_result:
+        return None
+    scope = json.dumps(
+        {
+            "provider": model_config.model_provider.provider,
+            "model": model_config.model,
+            "tools": [
+                [tool.get_name(), tool.get_description(), tool.get_input_schema()]
+                for tool in tools or ()
+            ],
+            "context": [asdict(message) for message in messages[:-1]],
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(scope.encode(), digest_size=16).hexdigest(), last.content
+
+
+def _response_from_dict(data: dict[str, Any]) -> LLMResponse:
+    return LLMResponse(
+        content=data["content"],
+        usage=LLMUsage(**data["usage"]) if data.get("usage") else None,
+        model=data.get("model"),
+        finish_reason=data.get("finish_reason"),
+        tool_calls=[ToolCall(**tool_call) for tool_call in data["tool_calls"]]
+        if data.get("tool_calls")
+        else None,
+    )
+
+
+class SemanticCache:
+    """Nearest-neighbour store of responses, persisted as an append-only JSON lines file.
+
+    Each line holds the scope, the embedding of the prompt and the response, so the index is
+    rebuilt from the file when the cache is opened.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, model_name: str = EMBEDDING_MODEL):
+        import hnswlib  # pyright: ignore[reportMissingImports]
+        from sentence_transformers import (  # pyright: ignore[reportMissingImports]
+            SentenceTransformer,
+        )
+
+        self._path: Path = path
+        self._encoder: Any = SentenceTransformer(model_name)
+        dimension: int = self._encoder.get_sentence_embedding_dimension()
+        self._index: Any = hnswlib.Index(space="cosine", dim=dimension)
+        self._index.init_index(max_elements=1024)
+        self._entries: list[tuple[str, dict[str, Any]]] = []
+        self._lock: threading.Lock = threading.Lock()
+
+        if path.exists():
+            with path.open() as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self._add(entry["scope"], entry["embedding"], entry["response"])
+
+    def _add(self, scope: str, embedding: list[float], response: dict[str, Any]) -> None:
+        if len(self._entries) == self._index.get_max_elements():
+            self._index.resize_index(2 * len(self._entries))
+        self._index.add_items([embedding], [len(self._entries)])
+        self._entries.append((scope, response))
+
+    def _embed(self, text: str) -> list[float]:
+        return self._encoder.encode(text, normalize_embeddings=True).tolist()
+
+    def lookup(self, scope: str, text: str, threshold: float) -> LLMResponse | None:
+        """Return the response to the most similar earlier prompt in this scope, if close enough."""
+        with self._lock:
+            if not self._entries:
+                return None
+            labels, distances = self._index.knn_query(
+                [self._embed(text)], k=min(_NEIGHBOURS, len(self._entries))
+            )
+            for label, distance in zip(labels[0], distances[0], strict=True):
+                entry_scope, response = self._entries[int(label)]
+                # hnswlib reports cosine distance, i.e. one minus the similarity
+                if entry_scope == scope and 1 - distance >= threshold:
+                    return _response_from_dict(response)
+        return None
+
+    def store(self, scope: str, text: str, response: LLMResponse) -> None:
+        """Remember a response and append it to the cache file."""
+        with self._lock:
+            embedding = self._embed(text)
+            data = asdict(response)
+            self._add(scope, embedding, data)
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a") as f:
+                _ = f.write(
+                    json.dumps({"scope": scope, "embedding": embedding, "response": data}) + "\n"
+                )
+
+
+@cache
+def get_semantic_cache() -> SemanticCache | None:
+    """Return the process-wide semantic cache, or None if it cannot be used here."""
+    try:
+        return SemanticCache()
+    except Exception:
+        # Missing optional packages, an unavailable model or a damaged file all disable it
+        return None
@@ -6,6 +6,7 @@
 import openai
 
 from trae_agent.utils.config import ModelConfig
+from trae_agent.utils.llm_clients._http import shared_http_client
 from trae_agent.utils.llm_clients.openai_compatible_base import (
     OpenAICompatibleClient,
     ProviderConfig,
@@ -26,6 +27,7 @@ class AzureProvider(ProviderConfig):
             azure_endpoint=base_url,
             api_version=api_version,
             api_key=api_key,
+            http_client=shared_http_client(),
         )
 
     def get_service_name(self) -> str:
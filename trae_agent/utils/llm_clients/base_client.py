@@ -1,28 +1,88 @@
 # Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-
+import asyncio
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, TypeVar
 
 from trae_agent.tools.base import Tool
 from trae_agent.utils.config import ModelConfig
 from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse
 from trae_agent.utils.trajectory_recorder import TrajectoryRecorder
 
+_T = TypeVar("_T")
+
 
 class BaseLLMClient(ABC):
-    """Base class for LLM clients."""
+    """Base class for LLM clients.
+
+    Clients send the system prompt and tool schemas ahead of an append-only history, so the
+    provider can serve repeated request prefixes from its prompt cache. Volatile context such as
+    retrieved documents or memory belongs in a trailing user message, not the system prompt.
+    """
 
     def __init__(self, model_config: ModelConfig):
         self.api_key: str = model_config.model_provider.api_key
         self.base_url: str | None = model_config.model_provider.base_url
         self.api_version: str | None = model_config.model_provider.api_version
         self.trajectory_recorder: TrajectoryRecorder | None = None  # TrajectoryRecorder instance
+        # Serialises the fallback achat(), since chat() keeps the pending request on the client
+        self._chat_lock: threading.Lock = threading.Lock()
+        # Provider tool schemas built for a tool set, keyed by builder and tool identity
+        self._tool_schema_cache: dict[tuple[Any, ...], tuple[tuple[Tool, ...], Any]] = {}
+        # Messages already in the history, by identity; holding them keeps their ids unique
+        self._committed_messages: dict[int, LLMMessage] = {}
 
     def set_trajectory_recorder(self, recorder: TrajectoryRecorder | None) -> None:
         """Set the trajectory recorder for this client."""
         self.trajectory_recorder = recorder
 
+    def close(self) -> None:
+        """Release the client's caches, including any held on the provider's side.
+
+        A closed client can still be used; it builds what it needs again.
+        """
+        self._tool_schema_cache.clear()
+
+    async def aclose(self) -> None:
+        """Asynchronous counterpart of close(); clients whose close() blocks override it."""
+        self.close()
+
+    def detached_copy(self, model_config: ModelConfig) -> "BaseLLMClient":
+        """Return a new client of the same kind with an empty history.
+
+        One-shot requests go through such a copy, so they never disturb this client's
+        conversation. The trajectory recorder is shared.
+        """
+        client = type(self)(model_config)
+        client.trajectory_recorder = self.trajectory_recorder
+        return client
+
+    def _cached_tool_schemas(self, tools: list[Tool], build: Callable[[list[Tool]], _T]) -> _T:
+        """Return build(tools), reusing the result for as long as the same tools are passed."""
+        key = (build.__name__, *((tool.get_name(), id(tool)) for tool in tools))
+        cached = self._tool_schema_cache.get(key)
+        if cached is None:
+            # The tools are kept alive with the schemas, so their ids cannot be reused meanwhile
+            cached = self._tool_schema_cache[key] = (tuple(tools), build(tools))
+        return cached[1]
+
+    def _uncommitted_messages(self, messages: list[LLMMessage]) -> list[LLMMessage]:
+        """Drop messages already in the history, so a turn that is sent again is not added twice."""
+        return [
+            message
+            for message in messages
+            if self._committed_messages.get(id(message)) is not message
+        ]
+
+    def _commit_messages(self, messages: list[LLMMessage], replace: bool = False) -> None:
+        """Note that these messages are now part of the history, optionally replacing it."""
+        if replace:
+            self._committed_messages.clear()
+        self._committed_messages.update((id(message), message) for message in messages)
+
     @abstractmethod
     def set_chat_history(self, messages: list[LLMMessage]) -> None:
         """Set the chat history."""
@@ -39,6 +99,50 @@ class BaseLLMClient(ABC):
         """Send chat messages to the LLM."""
         pass
 
+    async def achat(
+        self,
+        messages: list[LLMMessage],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+        reuse_history: bool = True,
+    ) -> LLMResponse:
+        """Send chat messages to the LLM without blocking the event loop.
+
+        Clients without a native async API run chat() in a worker thread, one call at a time.
+        """
+        return await asyncio.to_thread(
+            self._locked_chat, messages, model_config, tools, reuse_history
+        )
+
+    def batch_chat(
+        self,
+        messages_batch: list[list[LLMMessage]],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+    ) -> list[LLMResponse]:
+        """Answer several independent conversations without touching the chat history.
+
+        Clients without a batch API answer them one at a time through a detached copy.
+        """
+        client = self.detached_copy(model_config)
+        try:
+            return [
+                client.chat(messages, model_config, tools, reuse_history=False)
+                for messages in messages_batch
+            ]
+        finally:
+            client.close()
+
+    def _locked_chat(
+        self,
+        messages: list[LLMMessage],
+        model_config: ModelConfig,
+        tools: list[Tool] | None,
+        reuse_history: bool,
+    ) -> LLMResponse:
+        with self._chat_lock:
+            return self.chat(messages, model_config, tools, reuse_history)
+
     def supports_tool_calling(self, model_config: ModelConfig) -> bool:
         """Check if the current model supports tool calling."""
         return model_config.supports_tool_calling
@@ -3,24 +3,95 @@
 
 """Google Gemini API client wrapper with tool integration."""
 
+import asyncio
+import concurrent.futures
+import contextlib
+import hashlib
+import io
+import itertools
 import json
-import traceback
-import uuid
-from typing import override
+import secrets
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, ClassVar, override
 
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
 from trae_agent.tools.base import Tool, ToolCall, ToolResult
 from trae_agent.utils.config import ModelConfig
+from trae_agent.utils.llm_clients._limiter import estimate_tokens, get_limiter
+from trae_agent.utils.llm_clients._response_cache import (
+    get_response_cache,
+    is_cacheable,
+    response_cache_key,
+)
 from trae_agent.utils.llm_clients.base_client import BaseLLMClient
 from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse, LLMUsage
-from trae_agent.utils.llm_clients.retry_utils import retry_with
+from trae_agent.utils.llm_clients.retry_utils import async_retry_with, retry_with
+
+_BATCH_DONE_STATES = frozenset(
+    (
+        types.JobState.JOB_STATE_SUCCEEDED,
+        types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+        types.JobState.JOB_STATE_FAILED,
+        types.JobState.JOB_STATE_CANCELLED,
+        types.JobState.JOB_STATE_EXPIRED,
+    )
+)
+
+
+# Longest text kept in the shared parts, so large tool outputs and files are not pinned in memory
+_SHARED_TEXT_PART_MAX_LENGTH = 256
+
+
+@lru_cache(maxsize=1024)
+def _shared_text_part(text: str) -> types.Part:
+    return types.Part(text=text)
+
+
+def _text_part(text: str) -> types.Part:
+    """Return a text part, shared for short prompts such as the task reminder that recur.
+
+    Parts are never modified once built, so one instance can appear in several contents.
+    """
+    if len(text) <= _SHARED_TEXT_PART_MAX_LENGTH:
+        return _shared_text_part(text)
+    return types.Part(text=text)
+
+
+@dataclass(slots=True)
+class _SharedToolCache:
+    """A context cache holding a system instruction and tool declarations, shared by clients."""
+
+    key: bytes
+    name: str | None = None
+    expiry: float = 0.0
+    # Clients currently referring to the cache; the last one to let go deletes it
+    users: int = 0
+    # Set while one client creates the cache, so the others wait for it rather than paying for
+    # their own; a concurrent future can be waited on from threads and event loops alike
+    creating: concurrent.futures.Future[str | None] | None = None
+
+
+# Context caches by digest of the API key, model, system instruction and tools. The API key is
+# part of the digest, as a cache only exists for the project that created it.
+_TOOL_CACHES: dict[bytes, _SharedToolCache] = {}
+_TOOL_CACHES_LOCK = threading.Lock()
 
 
 class GoogleClient(BaseLLMClient):
     """Google Gemini client wrapper with tool schema generation."""
 
+    # Seconds to wait between checks on a running batch job
+    BATCH_POLL_INTERVAL: float = 30.0
+
+    # Lifetime of the explicit context cache holding the system instruction and tool declarations
+    TOOL_CACHE_TTL_SECONDS: int = 3600
+
     def __init__(self, model_config: ModelConfig):
         super().__init__(model_config)
 
@@ -28,10 +99,33 @@ class GoogleClient(BaseLLMClient):
         self.message_history: list[types.Content] = []
         self.system_instruction: str | None = None
 
+        # Digest of the shared context cache this client refers to, if any
+        self._tool_cache_key: bytes | None = None
+
+    @override
+    def close(self) -> None:
+        """Delete the shared context cache if this client was the last to use it."""
+        super().close()
+        with _TOOL_CACHES_LOCK:
+            unused = self._release_tool_cache()
+        if unused:
+            with contextlib.suppress(errors.APIError):
+                self.client.caches.delete(name=unused)
+
+    @override
+    async def aclose(self) -> None:
+        super().close()
+        with _TOOL_CACHES_LOCK:
+            unused = self._release_tool_cache()
+        if unused:
+            with contextlib.suppress(errors.APIError):
+                await self.client.aio.caches.delete(name=unused)
+
     @override
     def set_chat_history(self, messages: list[LLMMessage]) -> None:
         """Set the chat history."""
         self.message_history, self.system_instruction = self.parse_messages(messages)
+        self._commit_messages(messages, replace=True)
 
     def _create_google_response(
         self,
@@ -46,6 +140,99 @@ class GoogleClient(BaseLLMClient):
             config=generation_config,
         )
 
+    def _open_google_stream(
+        self,
+        model_config: ModelConfig,
+        current_chat_contents: list[types.Content],
+        generation_config: types.GenerateContentConfig,
+    ) -> Iterator[types.GenerateContentResponse]:
+        """Start a streamed response from Gemini. This method will be decorated with retry logic.
+
+        The request is only sent once the stream is read, so the first chunk is fetched here.
+        """
+        stream = iter(
+            self.client.models.generate_content_stream(  # pyright: ignore[reportUnknownMemberType]
+                model=model_config.model,
+                contents=current_chat_contents,
+                config=generation_config,
+            )
+        )
+        first_chunk = next(stream, None)
+        if first_chunk is None:
+            return stream
+        return itertools.chain((first_chunk,), stream)
+
+    def _create_google_stream(
+        self,
+        model_config: ModelConfig,
+        current_chat_contents: list[types.Content],
+        generation_config: types.GenerateContentConfig,
+        on_token: Callable[[str], None],
+    ) -> types.GenerateContentResponse:
+        """Stream a response from Gemini, passing each piece of text to on_token as it arrives.
+
+        The chunks are merged into one response, with the text joined into a single part ahead
+        of the function calls. Only opening the stream is retried: once text has been passed on,
+        a failure is raised rather than repeating that text.
+        """
+        open_stream = retry_with(
+            func=self._open_google_stream,
+            provider_name="Google Gemini",
+            max_retries=model_config.max_retries,
+        )
+        text = io.StringIO()
+        function_call_parts: list[types.Part] = []
+        finish_reason: types.FinishReason | None = None
+        usage_metadata: types.GenerateContentResponseUsageMetadata | None = None
+        for chunk in open_stream(model_config, current_chat_contents, generation_config):
+            # Token counts are cumulative, so the last chunk reporting them holds the totals
+            usage_metadata = chunk.usage_metadata or usage_metadata
+            if not chunk.candidates:
+                continue
+            candidate = chunk.candidates[0]
+            finish_reason = candidate.finish_reason or finish_reason
+            for part in candidate.content.parts or () if candidate.content else ():
+                if part.text:
+                    _ = text.write(part.text)
+                    on_token(part.text)
+                elif part.function_call:
+                    function_call_parts.append(part)
+
+        parts = [types.Part(text=text.getvalue())] if text.tell() else []
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=parts + function_call_parts),
+                    finish_reason=finish_reason,
+                )
+            ],
+            usage_metadata=usage_metadata,
+        )
+
+    async def _acreate_google_response(
+        self,
+        model_config: ModelConfig,
+        current_chat_contents: list[types.Content],
+        generation_config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        """Asynchronous counterpart of _create_google_response, kept within the model's quota."""
+        limiter = get_limiter(model_config)
+        prompt_tokens = 0
+        if limiter:
+            prompt_tokens = estimate_tokens(
+                "".join(
+                    part.text or ""
+                    for content in current_chat_contents
+                    for part in content.parts or ()
+                )
+            )
+        async with limiter.acquire(prompt_tokens) if limiter else contextlib.nullcontext():
+            return await self.client.aio.models.generate_content(  # pyright: ignore[reportUnknownMemberType]
+                model=model_config.model,
+                contents=current_chat_contents,
+                config=generation_config,
+            )
+
     @override
     def chat(
         self,
@@ -53,8 +240,157 @@ class GoogleClient(BaseLLMClient):
         model_config: ModelConfig,
         tools: list[Tool] | None = None,
         reuse_history: bool = True,
+        on_token: Callable[[str], None] | None = None,
     ) -> LLMResponse:
-        """Send chat messages to Gemini with optional tool support."""
+        """Send chat messages to Gemini with optional tool support.
+
+        With on_token, the response is streamed and its text is passed on as it arrives; a
+        replayed response is passed on in one piece.
+        """
+        (
+            newly_parsed_messages,
+            current_system_instruction,
+            current_chat_contents,
+            generation_config,
+        ) = self._prepare_chat(messages, model_config, tools, reuse_history)
+        if tools:
+            self._add_tools(
+                generation_config,
+                tools,
+                self._tool_cache(model_config, current_system_instruction, tools),
+            )
+
+        cache_key = self._response_cache_key(
+            model_config, current_chat_contents, current_system_instruction, tools
+        )
+        response = self._cached_response(cache_key)
+        streamed = False
+        if response is None:
+            if on_token:
+                response = self._create_google_stream(
+                    model_config, current_chat_contents, generation_config, on_token
+                )
+                streamed = True
+            else:
+                # Apply retry decorator to the API call
+                retry_decorator = retry_with(
+                    func=self._create_google_response,
+                    provider_name="Google Gemini",
+                    max_retries=model_config.max_retries,
+                )
+                response = retry_decorator(model_config, current_chat_contents, generation_config)
+            self._cache_response(cache_key, response)
+
+        llm_response = self._complete_chat(
+            response,
+            messages,
+            newly_parsed_messages,
+            current_system_instruction,
+            model_config,
+            tools,
+            reuse_history,
+        )
+        if on_token and not streamed and llm_response.content:
+            on_token(llm_response.content)
+        return llm_response
+
+    @override
+    async def achat(
+        self,
+        messages: list[LLMMessage],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+        reuse_history: bool = True,
+    ) -> LLMResponse:
+        """Send chat messages to Gemini through the SDK's async client."""
+        (
+            newly_parsed_messages,
+            current_system_instruction,
+            current_chat_contents,
+            generation_config,
+        ) = self._prepare_chat(messages, model_config, tools, reuse_history)
+        if tools:
+            self._add_tools(
+                generation_config,
+                tools,
+                await self._atool_cache(model_config, current_system_instruction, tools),
+            )
+
+        cache_key = self._response_cache_key(
+            model_config, current_chat_contents, current_system_instruction, tools
+        )
+        response = self._cached_response(cache_key)
+        if response is None:
+            retry_decorator = async_retry_with(
+                func=self._acreate_google_response,
+                provider_name="Google Gemini",
+                max_retries=model_config.max_retries,
+            )
+            response = await retry_decorator(model_config, current_chat_contents, generation_config)
+            self._cache_response(cache_key, response)
+
+        return self._complete_chat(
+            response,
+            messages,
+            newly_parsed_messages,
+            current_system_instruction,
+            model_config,
+            tools,
+            reuse_history,
+        )
+
+    def _response_cache_key(
+        self,
+        model_config: ModelConfig,
+        contents: list[types.Content],
+        system_instruction: str | None,
+        tools: list[Tool] | None,
+    ) -> str | None:
+        """Key of the request in the response cache, or None if it must not be cached."""
+        if not is_cacheable(model_config):
+            return None
+        # The tools are described by value, as the context cache name differs between runs
+        return response_cache_key(
+            model_config,
+            {
+                "contents": [
+                    content.model_dump(mode="json", exclude_none=True) for content in contents
+                ],
+                "system_instruction": system_instruction,
+                "tools": self._tool_specs(tools) if tools else "",
+                "generation": self._generation_parameters(model_config),
+            },
+        )
+
+    def _cached_response(self, cache_key: str | None) -> types.GenerateContentResponse | None:
+        """Return the stored response for this request, if there is one."""
+        if cache_key is None:
+            return None
+        cached = get_response_cache().get(cache_key)
+        if cached is None:
+            return None
+        return types.GenerateContentResponse.model_validate(cached)
+
+    def _cache_response(
+        self, cache_key: str | None, response: types.GenerateContentResponse
+    ) -> None:
+        if cache_key is not None:
+            get_response_cache().set(cache_key, response.model_dump(mode="json", exclude_none=True))
+
+    def _prepare_chat(
+        self,
+        messages: list[LLMMessage],
+        model_config: ModelConfig,
+        tools: list[Tool] | None,
+        reuse_history: bool,
+    ) -> tuple[list[types.Content], str | None, list[types.Content], types.GenerateContentConfig]:
+        """Parse the new messages and build the request contents and generation config.
+
+        The tools are added by the caller through _add_tools, once it has looked up their context
+        cache. The history itself is left alone until a response has been received.
+        """
+        if reuse_history:
+            messages = self._uncommitted_messages(messages)
         newly_parsed_messages, system_instruction_from_message = self.parse_messages(messages)
 
         current_system_instruction = system_instruction_from_message or self.system_instruction
@@ -66,54 +402,352 @@ class GoogleClient(BaseLLMClient):
 
         # Set up generation config
         generation_config = types.GenerateContentConfig(
-            temperature=model_config.temperature,
-            top_p=model_config.top_p,
-            top_k=model_config.top_k,
-            max_output_tokens=model_config.max_tokens,
-            candidate_count=model_config.candidate_count,
-            stop_sequences=model_config.stop_sequences,
+            **self._generation_parameters(model_config),
             system_instruction=current_system_instruction,
         )
 
-        # Add tools if provided
+        return (
+            newly_parsed_messages,
+            current_system_instruction,
+            current_chat_contents,
+            generation_config,
+        )
+
+    def _add_tools(
+        self,
+        generation_config: types.GenerateContentConfig,
+        tools: list[Tool],
+        cache_name: str | None,
+    ) -> None:
+        """Add the tools to the request, referring to their context cache when there is one."""
+        if cache_name:
+            generation_config.cached_content = cache_name
+            generation_config.system_instruction = None
+        else:
+            generation_config.tools = self._tool_schemas(tools)
+
+    def _complete_chat(
+        self,
+        response: types.GenerateContentResponse,
+        messages: list[LLMMessage],
+        newly_parsed_messages: list[types.Content],
+        current_system_instruction: str | None,
+        model_config: ModelConfig,
+        tools: list[Tool] | None,
+        reuse_history: bool,
+    ) -> LLMResponse:
+        """Record the exchange in the history and trajectory and return the parsed response."""
+        llm_response = self._parse_response(response, model_config)
+        assistant_response_content = None
+        if response.candidates:
+            candidate = response.candidates[0]
+            if candidate.content and candidate.content.parts:
+                assistant_response_content = candidate.content
+
+        # Earlier turns are kept as they were sent and the new ones appended after them, so the
+        # system instruction, tools and history form a stable prefix for Gemini's implicit cache
+        if reuse_history:
+            self.message_history.extend(newly_parsed_messages)
+            self._commit_messages(messages)
+        else:
+            self.message_history = newly_parsed_messages
+            self._commit_messages(messages, replace=True)
+
+        if assistant_response_content:
+            self.message_history.append(assistant_response_content)
+
+        if current_system_instruction:
+            self.system_instruction = current_system_instruction
+
+        if self.trajectory_recorder:
+            self.trajectory_recorder.record_llm_interaction(
+                messages=messages,
+                response=llm_response,
+                provider="google",
+                model=model_config.model,
+                tools=tools,
+            )
+
+        return llm_response
+
+    @override
+    def batch_chat(
+        self,
+        messages_batch: list[list[LLMMessage]],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+    ) -> list[LLMResponse]:
+        """Answer several independent conversations through the Gemini Batch API.
+
+        The requests are uploaded as one JSONL file and the call blocks until the batch job
+        finishes, so this suits offline runs rather than interactive ones. The chat history is
+        neither used nor updated.
+        """
+        generation_config = types.GenerationConfig(**self._generation_parameters(model_config))
+        shared_request: dict[str, Any] = {
+            "generationConfig": generation_config.model_dump(
+                mode="json", by_alias=True, exclude_none=True
+            )
+        }
         if tools:
-            tool_schemas = [
-                types.Tool(
-                    function_declarations=[
-                        types.FunctionDeclaration(
-                            name=tool.get_name(),
-                            description=tool.get_description(),
-                            parameters=tool.get_input_schema(),  # pyright: ignore[reportArgumentType]
-                        )
-                    ]
-                )
-                for tool in tools
+            shared_request["tools"] = [
+                tool_schema.model_dump(mode="json", by_alias=True, exclude_none=True)
+                for tool_schema in self._tool_schemas(tools)
             ]
-            generation_config.tools = tool_schemas
 
-        # Apply retry decorator to the API call
-        retry_decorator = retry_with(
-            func=self._create_google_response,
-            provider_name="Google Gemini",
-            max_retries=model_config.max_retries,
+        lines: list[str] = []
+        for index, messages in enumerate(messages_batch):
+            contents, system_instruction = self.parse_messages(messages)
+            system_instruction = system_instruction or self.system_instruction
+            request = dict(shared_request)
+            request["contents"] = [
+                content.model_dump(mode="json", by_alias=True, exclude_none=True)
+                for content in contents
+            ]
+            if system_instruction:
+                request["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+            lines.append(json.dumps({"key": str(index), "request": request}))
+
+        requests_file = self.client.files.upload(
+            file=io.BytesIO("\n".join(lines).encode()),
+            config=types.UploadFileConfig(mime_type="jsonl"),
+        )
+        if not requests_file.name:
+            raise RuntimeError("Gemini did not return a name for the uploaded batch requests")
+
+        batch_job = self.client.batches.create(model=model_config.model, src=requests_file.name)
+        while batch_job.state not in _BATCH_DONE_STATES:
+            time.sleep(self.BATCH_POLL_INTERVAL)
+            if not batch_job.name:
+                raise RuntimeError("Gemini did not return a name for the batch job")
+            batch_job = self.client.batches.get(name=batch_job.name)
+
+        # Requests that failed inside a partially successful job are reported below
+        if batch_job.state not in (
+            types.JobState.JOB_STATE_SUCCEEDED,
+            types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+        ):
+            raise RuntimeError(f"Gemini batch job {batch_job.name} ended in {batch_job.state}")
+        if not batch_job.dest or not batch_job.dest.file_name:
+            raise RuntimeError(f"Gemini batch job {batch_job.name} has no result file")
+
+        results: dict[str, dict[str, Any]] = {}
+        for line in self.client.files.download(file=batch_job.dest.file_name).splitlines():
+            if line.strip():
+                result = json.loads(line)
+                results[result["key"]] = result
+
+        llm_responses: list[LLMResponse] = []
+        for index, messages in enumerate(messages_batch):
+            result = results.get(str(index))
+            if result is None or "response" not in result:
+                error = result.get("error") if result else "missing from the batch results"
+                raise RuntimeError(f"Gemini batch request {index} failed: {error}")
+            response = types.GenerateContentResponse.model_validate(result["response"])
+            llm_response = self._parse_response(response, model_config)
+            if self.trajectory_recorder:
+                self.trajectory_recorder.record_llm_interaction(
+                    messages=messages,
+                    response=llm_response,
+                    provider="google",
+                    model=model_config.model,
+                    tools=tools,
+                )
+            llm_responses.append(llm_response)
+        return llm_responses
+
+    def _generation_parameters(self, model_config: ModelConfig) -> dict[str, Any]:
+        """Generation settings shared by direct and batched requests."""
+        return {
+            "temperature": model_config.temperature,
+            "top_p": model_config.top_p,
+            "top_k": model_config.top_k,
+            "max_output_tokens": model_config.max_tokens,
+            "candidate_count": model_config.candidate_count,
+            "stop_sequences": model_config.stop_sequences,
+        }
+
+    def _tool_schemas(self, tools: list[Tool]) -> list[types.Tool]:
+        """Return the Gemini function declarations for the given tools."""
+        return self._cached_tool_schemas(tools, self._build_tool_schemas)
+
+    @staticmethod
+    def _build_tool_schemas(tools: list[Tool]) -> list[types.Tool]:
+        return [
+            types.Tool(
+                function_declarations=[
+                    types.FunctionDeclaration(
+                        name=tool.get_name(),
+                        description=tool.get_description(),
+                        parameters=tool.get_input_schema(),  # pyright: ignore[reportArgumentType]
+                    )
+                ]
+            )
+            for tool in tools
+        ]
+
+    def _tool_specs(self, tools: list[Tool]) -> str:
+        """Return the names, descriptions and schemas of the tools as canonical JSON."""
+        return self._cached_tool_schemas(tools, self._build_tool_specs)
+
+    @staticmethod
+    def _build_tool_specs(tools: list[Tool]) -> str:
+        return json.dumps(
+            [[tool.get_name(), tool.get_description(), tool.get_input_schema()] for tool in tools],
+            sort_keys=True,
         )
-        response = retry_decorator(model_config, current_chat_contents, generation_config)
 
+    def _tool_cache(
+        self, model_config: ModelConfig, system_instruction: str | None, tools: list[Tool]
+    ) -> str | None:
+        """Return the name of a context cache holding the system instruction and tools.
+
+        The cache is shared by every client sending the same instruction and tools. It is
+        created on first use and recreated when it is about to expire. None is returned if Gemini
+        refuses to cache them, e.g. because they are below the model's minimum cacheable size.
+        """
+        cache_name, shared, unused = self._claim_tool_cache(model_config, system_instruction, tools)
+        if unused:
+            with contextlib.suppress(errors.APIError):
+                self.client.caches.delete(name=unused)
+        if shared is not None:
+            name, answered = None, False
+            try:
+                name = self.client.caches.create(
+                    model=model_config.model,
+                    config=self._tool_cache_config(system_instruction, tools),
+                ).name
+                answered = True
+            except errors.APIError:
+                answered = True
+            finally:
+                unused = self._settle_tool_cache(shared, name, answered)
+            if unused:
+                with contextlib.suppress(errors.APIError):
+                    self.client.caches.delete(name=unused)
+        return cache_name.result()
+
+    async def _atool_cache(
+        self, model_config: ModelConfig, system_instruction: str | None, tools: list[Tool]
+    ) -> str | None:
+        """Asynchronous counterpart of _tool_cache, which keeps the event loop free."""
+        cache_name, shared, unused = self._claim_tool_cache(model_config, system_instruction, tools)
+        if unused:
+            with contextlib.suppress(errors.APIError):
+                await self.client.aio.caches.delete(name=unused)
+        if shared is not None:
+            name, answered = None, False
+            try:
+                cached_content = await self.client.aio.caches.create(
+                    model=model_config.model,
+                    config=self._tool_cache_config(system_instruction, tools),
+                )
+                name, answered = cached_content.name, True
+            except errors.APIError:
+                answered = True
+            finally:
+                unused = self._settle_tool_cache(shared, name, answered)
+            if unused:
+                with contextlib.suppress(errors.APIError):
+                    await self.client.aio.caches.delete(name=unused)
+        return await asyncio.wrap_future(cache_name)
+
+    def _tool_cache_config(
+        self, system_instruction: str | None, tools: list[Tool]
+    ) -> types.CreateCachedContentConfig:
+        return types.CreateCachedContentConfig(
+            system_instruction=system_instruction,
+            tools=self._tool_schemas(tools),
+            ttl=f"{self.TOOL_CACHE_TTL_SECONDS}s",
+        )
+
+    def _claim_tool_cache(
+        self, model_config: ModelConfig, system_instruction: str | None, tools: list[Tool]
+    ) -> tuple[concurrent.futures.Future[str | None], _SharedToolCache | None, str | None]:
+        """Switch this client over to the shared cache for this instruction and tools.
+
+        Returns a future for the cache name, the shared cache if the caller has to create it
+        and complete the future through _settle_tool_cache, and the name of a cache this client
+        no longer refers to that nobody else uses, which the caller should delete.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.api_key.encode())
+        digest.update(b"\0" + model_config.model.encode())
+        digest.update(b"\0" + (system_instruction or "").encode())
+        digest.update(b"\0" + self._tool_specs(tools).encode())
+        key = digest.digest()
+
+        with _TOOL_CACHES_LOCK:
+            unused = None
+            if key != self._tool_cache_key:
+                unused = self._release_tool_cache()
+                self._tool_cache_key = key
+                _TOOL_CACHES.setdefault(key, _SharedToolCache(key)).users += 1
+            shared = _TOOL_CACHES[key]
+            if shared.creating is not None:
+                return shared.creating, None, unused
+            cache_name: concurrent.futures.Future[str | None] = concurrent.futures.Future()
+            if time.monotonic() < shared.expiry:
+                cache_name.set_result(shared.name)
+                return cache_name, None, unused
+            shared.creating = cache_name
+            return cache_name, shared, unused
+
+    @staticmethod
+    def _settle_tool_cache(
+        shared: _SharedToolCache, name: str | None, answered: bool
+    ) -> str | None:
+        """Record the outcome of creating a shared cache and pass its name to waiting clients.
+
+        Returns the name if every client let go of the cache while it was being created.
+        """
+        with _TOOL_CACHES_LOCK:
+            cache_name, shared.creating = shared.creating, None
+            if answered:
+                # Don't ask again for refused content until the TTL would have run out, and stop
+                # using a cache a minute early so requests never refer to an expired one
+                shared.name = name
+                shared.expiry = time.monotonic() + GoogleClient.TOOL_CACHE_TTL_SECONDS - 60
+            unused = None
+            if shared.users == 0:
+                unused = shared.name
+                _ = _TOOL_CACHES.pop(shared.key, None)
+        if cache_name is not None:
+            cache_name.set_result(name)
+        return unused
+
+    def _release_tool_cache(self) -> str | None:
+        """Stop referring to the shared cache; must be called with _TOOL_CACHES_LOCK held.
+
+        Returns the name of the cache if this client was the last to use it.
+        """
+        key, self._tool_cache_key = self._tool_cache_key, None
+        shared = _TOOL_CACHES.get(key) if key is not None else None
+        if shared is None:
+            return None
+        shared.users -= 1
+        if shared.users or shared.creating is not None:
+            return None
+        del _TOOL_CACHES[key]
+        return shared.name
+
+    def _parse_response(
+        self, response: types.GenerateContentResponse, model_config: ModelConfig
+    ) -> LLMResponse:
+        """Convert a Gemini response into an LLMResponse."""
         content = ""
         tool_calls: list[ToolCall] = []
-        assistant_response_content = None
 
         if response.candidates:
             candidate = response.candidates[0]
             if candidate.content and candidate.content.parts:
-                assistant_response_content = candidate.content
                 for part in candidate.content.parts:
                     if part.text:
                         content += part.text
                     elif part.function_call:
                         tool_calls.append(
                             ToolCall(
-                                call_id=str(uuid.uuid4()),
+                                call_id=secrets.token_hex(16),
                                 name=part.function_call.name or "tool",
                                 arguments=dict(part.function_call.args)
                                 if part.function_call.args
@@ -121,19 +755,6 @@ class GoogleClient(BaseLLMClient):
                             )
                         )
 
-        if reuse_history:
-            new_history = self.message_history + newly_parsed_messages
-        else:
-            new_history = newly_parsed_messages
-
-        if assistant_response_content:
-            new_history.append(assistant_response_content)
-
-        self.message_history = new_history
-
-        if current_system_instruction:
-            self.system_instruction = current_system_instruction
-
         usage = None
         if response.usage_metadata:
             usage = LLMUsage(
@@ -143,7 +764,7 @@ class GoogleClient(BaseLLMClient):
                 cache_creation_input_tokens=0,
             )
 
-        llm_response = LLMResponse(
+        return LLMResponse(
             content=content,
             usage=usage,
             model=model_config.model,
@@ -157,45 +778,40 @@ class GoogleClient(BaseLLMClient):
             tool_calls=tool_calls if len(tool_calls) > 0 else None,
         )
 
-        if self.trajectory_recorder:
-            self.trajectory_recorder.record_llm_interaction(
-                messages=messages,
-                response=llm_response,
-                provider="google",
-                model=model_config.model,
-                tools=tools,
-            )
-
-        return llm_response
-
     def parse_messages(self, messages: list[LLMMessage]) -> tuple[list[types.Content], str | None]:
         """Parse the messages to Gemini format, separating system instructions."""
         gemini_messages: list[types.Content] = []
         system_instruction: str | None = None
 
         for msg in messages:
-            if msg.role == "system":
+            kind = msg.kind
+            if kind == "system":
                 system_instruction = msg.content
-                continue
-            elif msg.tool_result:
-                gemini_messages.append(
-                    types.Content(
-                        role="tool",
-                        parts=[self.parse_tool_call_result(msg.tool_result)],
-                    )
-                )
-            elif msg.tool_call:
-                gemini_messages.append(
-                    types.Content(role="model", parts=[self.parse_tool_call(msg.tool_call)])
-                )
             else:
-                role = "user" if msg.role == "user" else "model"
                 gemini_messages.append(
-                    types.Content(role=role, parts=[types.Part(text=msg.content or "")])
+                    self._CONTENT_PARSERS.get(kind, GoogleClient._parse_text_message)(self, msg)
                 )
 
         return gemini_messages, system_instruction
 
+    def _parse_tool_result_message(self, msg: LLMMessage) -> types.Content:
+        assert msg.tool_result is not None
+        return types.Content(role="tool", parts=[self.parse_tool_call_result(msg.tool_result)])
+
+    def _parse_tool_call_message(self, msg: LLMMessage) -> types.Content:
+        assert msg.tool_call is not None
+        return types.Content(role="model", parts=[self.parse_tool_call(msg.tool_call)])
+
+    def _parse_text_message(self, msg: LLMMessage) -> types.Content:
+        role = "user" if msg.role == "user" else "model"
+        return types.Content(role=role, parts=[_text_part(msg.content or "")])
+
+    # Content builders by message kind; any other role is sent as model text
+    _CONTENT_PARSERS: ClassVar[dict[str, Callable[["GoogleClient", LLMMessage], types.Content]]] = {
+        "tool_result": _parse_tool_result_message,
+        "tool_call": _parse_tool_call_message,
+    }
+
     def parse_tool_call(self, tool_call: ToolCall) -> types.Part:
         """Parse a ToolCall into a Gemini FunctionCall Part for history."""
         return types.Part.from_function_call(name=tool_call.name, args=tool_call.arguments)
@@ -203,13 +819,17 @@ class GoogleClient(BaseLLMClient):
     def parse_tool_call_result(self, tool_result: ToolResult) -> types.Part:
         """Parse a ToolResult into a Gemini FunctionResponse Part for history."""
         result_content: dict[str, str] = {}
-        if tool_result.result is not None:
+        # Results are normally strings, which need no serialisation check
+        if isinstance(tool_result.result, str):
+            result_content["result"] = tool_result.result
+        elif tool_result.result is not None:
             try:
-                json.dumps(tool_result.result)
+                _ = json.dumps(tool_result.result)
                 result_content["result"] = tool_result.result
-            except (TypeError, OverflowError) as e:
-                tb = traceback.format_exc()
-                serialization_error = f"JSON serialization failed for tool result: {e}\n{tb}"
+            except (TypeError, ValueError, OverflowError) as e:
+                serialization_error = (
+                    f"JSON serialization failed for tool result: {type(e).__name__}: {e}"
+                )
                 if tool_result.error:
                     result_content["error"] = f"{tool_result.error}\n\n{serialization_error}"
                 else:
@@ -16,6 +16,15 @@ class LLMMessage:
     tool_call: ToolCall | None = None
     tool_result: ToolResult | None = None
 
+    @property
+    def kind(self) -> str:
+        """What the message carries: "tool_result", "tool_call", or else its role."""
+        if self.tool_result:
+            return "tool_result"
+        if self.tool_call:
+            return "tool_call"
+        return self.role
+
 
 @dataclass
 class LLMUsage:
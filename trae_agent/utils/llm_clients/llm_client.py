@@ -3,10 +3,13 @@
 
 """LLM Client wrapper for OpenAI, Anthropic, Azure, and OpenRouter APIs."""
 
+import asyncio
+import contextlib
 from enum import Enum
 
 from trae_agent.tools.base import Tool
 from trae_agent.utils.config import ModelConfig
+from trae_agent.utils.llm_clients._semantic_cache import get_semantic_cache, semantic_cache_scope
 from trae_agent.utils.llm_clients.base_client import BaseLLMClient
 from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse
 from trae_agent.utils.trajectory_recorder import TrajectoryRecorder
@@ -77,8 +80,88 @@ class LLMClient:
         reuse_history: bool = True,
     ) -> LLMResponse:
         """Send chat messages to the LLM."""
+        # Only requests that carry their whole context can be answered without the client,
+        # since a cached answer never reaches the client's history
+        if model_config.semantic_cache_threshold is not None and not reuse_history:
+            return self._semantic_chat(messages, model_config, tools)
         return self.client.chat(messages, model_config, tools, reuse_history)
 
+    def _semantic_chat(
+        self, messages: list[LLMMessage], model_config: ModelConfig, tools: list[Tool] | None
+    ) -> LLMResponse:
+        """Answer a one-shot request from the semantic cache when a close enough one was seen."""
+        semantic_cache = get_semantic_cache()
+        scope = semantic_cache_scope(model_config, messages, tools) if semantic_cache else None
+        if semantic_cache is None or scope is None:
+            return self.client.chat(messages, model_config, tools, reuse_history=False)
+
+        threshold = model_config.semantic_cache_threshold
+        assert threshold is not None
+        cached_response = None
+        with contextlib.suppress(Exception):
+            cached_response = semantic_cache.lookup(*scope, threshold)
+        if cached_response is not None:
+            return cached_response
+
+        llm_response = self.client.chat(messages, model_config, tools, reuse_history=False)
+        with contextlib.suppress(Exception):
+            semantic_cache.store(*scope, llm_response)
+        return llm_response
+
+    async def achat(
+        self,
+        messages: list[LLMMessage],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+        reuse_history: bool = True,
+    ) -> LLMResponse:
+        """Send chat messages to the LLM without blocking the event loop."""
+        return await self.client.achat(messages, model_config, tools, reuse_history)
+
+    async def achat_many(
+        self,
+        messages_batch: list[list[LLMMessage]],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+    ) -> list[LLMResponse]:
+        """Send several independent conversations concurrently, each without history.
+
+        Every conversation gets its own detached client, so the ongoing conversation is left
+        untouched and the requests do not queue behind one another.
+        """
+        clients = [self.client.detached_copy(model_config) for _ in messages_batch]
+        try:
+            return list(
+                await asyncio.gather(
+                    *(
+                        client.achat(messages, model_config, tools, reuse_history=False)
+                        for client, messages in zip(clients, messages_batch, strict=True)
+                    )
+                )
+            )
+        finally:
+            _ = await asyncio.gather(*(client.aclose() for client in clients))
+
+    def batch_chat(
+        self,
+        messages_batch: list[list[LLMMessage]],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+    ) -> list[LLMResponse]:
+        """Send several independent conversations, using the provider's batch API if it has one.
+
+        The ongoing conversation is neither used nor changed.
+        """
+        return self.client.batch_chat(messages_batch, model_config, tools)
+
+    def close(self) -> None:
+        """Release what the client holds on the provider's side, such as context caches."""
+        self.client.close()
+
+    async def aclose(self) -> None:
+        """Asynchronous counterpart of close()."""
+        await self.client.aclose()
+
     def supports_tool_calling(self, model_config: ModelConfig) -> bool:
         """Check if the current client supports tool calling."""
         return hasattr(self.client, "supports_tool_calling") and self.client.supports_tool_calling(
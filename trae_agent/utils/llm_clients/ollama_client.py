@@ -5,14 +5,19 @@
 Ollama API client wrapper with tool integration
 """
 
+import asyncio
+import contextlib
 import json
-import uuid
-from typing import override
+import secrets
+from collections.abc import Callable
+from typing import Any, ClassVar, override
 
 import openai
+from ollama import AsyncClient as OllamaAsyncClient
+from ollama import ChatResponse
+from ollama import Tool as OllamaTool
 from ollama import chat as ollama_chat  # pyright: ignore[reportUnknownVariableType]
 from openai.types.responses import (
-    FunctionToolParam,
     ResponseFunctionToolCallParam,
     ResponseInputParam,
 )
@@ -20,9 +25,31 @@ from openai.types.responses.response_input_param import FunctionCallOutput
 
 from trae_agent.tools.base import Tool, ToolCall, ToolResult
 from trae_agent.utils.config import ModelConfig
+from trae_agent.utils.llm_clients._http import shared_http_client
+from trae_agent.utils.llm_clients._limiter import estimate_tokens, get_limiter
+from trae_agent.utils.llm_clients._response_cache import (
+    get_response_cache,
+    is_cacheable,
+    response_cache_key,
+)
 from trae_agent.utils.llm_clients.base_client import BaseLLMClient
 from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse
-from trae_agent.utils.llm_clients.retry_utils import retry_with
+from trae_agent.utils.llm_clients.retry_utils import async_retry_with, retry_with
+
+# orjson serialises faster than the standard library; use it when it happens to be installed
+try:
+    from orjson import dumps as _orjson_dumps
+except ImportError:
+    _orjson_dumps = None
+
+
+def _dumps_arguments(arguments: object) -> str:
+    """Serialise tool call arguments, passing through ones that are already JSON text."""
+    if isinstance(arguments, str):
+        return arguments
+    if _orjson_dumps is not None:
+        return _orjson_dumps(arguments).decode()
+    return json.dumps(arguments)
 
 
 class OllamaClient(BaseLLMClient):
@@ -35,39 +62,94 @@ class OllamaClient(BaseLLMClient):
             base_url=model_config.model_provider.base_url
             if model_config.model_provider.base_url
             else "http://localhost:11434/v1",
+            http_client=shared_http_client(),
         )
 
-        self.message_history: ResponseInputParam = []
+        # System messages are kept apart from the conversation and always sent first, so the
+        # start of every request stays byte-identical and the server can reuse its prompt cache
+        self._cache_anchor: ResponseInputParam = []
+        self._tail: ResponseInputParam = []
+
+        self._async_client: OllamaAsyncClient | None = None
+        self._async_client_loop: asyncio.AbstractEventLoop | None = None
 
     @override
     def set_chat_history(self, messages: list[LLMMessage]) -> None:
-        self.message_history = self.parse_messages(messages)
+        self._cache_anchor, self._tail = self._split_system_messages(self.parse_messages(messages))
+        self._commit_messages(messages, replace=True)
 
-    def _create_ollama_response(
-        self,
-        model_config: ModelConfig,
-        tool_schemas: list[FunctionToolParam] | None,
-    ):
-        """Create a response using Ollama API. This method will be decorated with retry logic."""
-        tools_param = None
-        if tool_schemas:
-            tools_param = [
+    @staticmethod
+    def _split_system_messages(
+        msgs: ResponseInputParam,
+    ) -> tuple[ResponseInputParam, ResponseInputParam]:
+        """Separate system messages from the rest of the conversation."""
+        system_messages: ResponseInputParam = []
+        conversation: ResponseInputParam = []
+        for msg in msgs:
+            if msg.get("role") == "system":
+                system_messages.append(msg)
+            else:
+                conversation.append(msg)
+        return system_messages, conversation
+
+    @staticmethod
+    def _build_tool_schemas(tools: list[Tool]) -> list[OllamaTool]:
+        """Build the tool definitions in the function format Ollama expects."""
+        # Validated once here, as ollama passes Tool instances through without copying them
+        return [
+            OllamaTool.model_validate(
                 {
                     "type": "function",
                     "function": {
-                        "name": tool["name"],
-                        "description": tool.get("description", ""),
-                        "parameters": tool["parameters"],
+                        "name": tool.name,
+                        "description": tool.description,
+                        "parameters": tool.get_input_schema(),
                     },
                 }
-                for tool in tool_schemas
-            ]
+            )
+            for tool in tools
+        ]
+
+    def _create_ollama_response(
+        self,
+        model_config: ModelConfig,
+        tool_schemas: list[OllamaTool] | None,
+        request_messages: ResponseInputParam,
+    ):
+        """Create a response using Ollama API. This method will be decorated with retry logic."""
         return ollama_chat(
-            messages=self.message_history,
+            messages=request_messages,
             model=model_config.model,
-            tools=tools_param,
+            tools=tool_schemas,
         )
 
+    async def _acreate_ollama_response(
+        self,
+        model_config: ModelConfig,
+        tool_schemas: list[OllamaTool] | None,
+        request_messages: ResponseInputParam,
+    ):
+        """Asynchronous counterpart of _create_ollama_response."""
+        # An async client is tied to the event loop it was first used on
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = OllamaAsyncClient()
+            self._async_client_loop = loop
+        limiter = get_limiter(model_config)
+        prompt_tokens = 0
+        if limiter:
+            prompt_tokens = estimate_tokens(
+                "".join(
+                    str(msg.get("content") or msg.get("output") or "") for msg in request_messages
+                )
+            )
+        async with limiter.acquire(prompt_tokens) if limiter else contextlib.nullcontext():
+            return await self._async_client.chat(  # pyright: ignore[reportUnknownMemberType]
+                messages=request_messages,
+                model=model_config.model,
+                tools=tool_schemas,
+            )
+
     @override
     def chat(
         self,
@@ -79,45 +161,140 @@ class OllamaClient(BaseLLMClient):
         """
         A rewritten version of ollama chan
         """
+        tool_schemas, system_messages, conversation, request_messages = self._prepare_chat(
+            messages, tools, reuse_history
+        )
+
+        cache_key = self._response_cache_key(model_config, request_messages, tool_schemas)
+        response = self._cached_response(cache_key)
+        if response is None:
+            # Apply retry decorator to the API call
+            retry_decorator = retry_with(
+                func=self._create_ollama_response,
+                provider_name="Ollama",
+                max_retries=model_config.max_retries,
+            )
+            response = retry_decorator(model_config, tool_schemas, request_messages)
+            self._cache_response(cache_key, response)
+
+        return self._complete_chat(
+            response, messages, system_messages, conversation, model_config, tools, reuse_history
+        )
+
+    @override
+    async def achat(
+        self,
+        messages: list[LLMMessage],
+        model_config: ModelConfig,
+        tools: list[Tool] | None = None,
+        reuse_history: bool = True,
+    ) -> LLMResponse:
+        """Send chat messages through Ollama's async client."""
+        tool_schemas, system_messages, conversation, request_messages = self._prepare_chat(
+            messages, tools, reuse_history
+        )
+
+        cache_key = self._response_cache_key(model_config, request_messages, tool_schemas)
+        response = self._cached_response(cache_key)
+        if response is None:
+            retry_decorator = async_retry_with(
+                func=self._acreate_ollama_response,
+                provider_name="Ollama",
+                max_retries=model_config.max_retries,
+            )
+            response = await retry_decorator(model_config, tool_schemas, request_messages)
+            self._cache_response(cache_key, response)
+
+        return self._complete_chat(
+            response, messages, system_messages, conversation, model_config, tools, reuse_history
+        )
+
+    def _response_cache_key(
+        self,
+        model_config: ModelConfig,
+        request_messages: ResponseInputParam,
+        tool_schemas: list[OllamaTool] | None,
+    ) -> str | None:
+        """Key of the request in the response cache, or None if it must not be cached."""
+        if not is_cacheable(model_config):
+            return None
+        return response_cache_key(
+            model_config,
+            {
+                "messages": request_messages,
+                "tools": [tool.model_dump(exclude_none=True) for tool in tool_schemas or ()],
+            },
+        )
+
+    def _cached_response(self, cache_key: str | None) -> ChatResponse | None:
+        """Return the stored response for this request, if there is one."""
+        if cache_key is None:
+            return None
+        cached = get_response_cache().get(cache_key)
+        if cached is None:
+            return None
+        return ChatResponse.model_validate(cached)
+
+    def _cache_response(self, cache_key: str | None, response: ChatResponse) -> None:
+        if cache_key is not None:
+            get_response_cache().set(cache_key, response.model_dump(mode="json", exclude_none=True))
+
+    def _prepare_chat(
+        self, messages: list[LLMMessage], tools: list[Tool] | None, reuse_history: bool
+    ) -> tuple[list[OllamaTool] | None, ResponseInputParam, ResponseInputParam, ResponseInputParam]:
+        """Build the tool schemas and the request from the history and the new messages.
+
+        The history itself is left alone until a response has been received. Returns the tool
+        schemas, the new system messages, the rest of the new messages and the full request.
+        """
+        if reuse_history:
+            messages = self._uncommitted_messages(messages)
         msgs: ResponseInputParam = self.parse_messages(messages)
 
-        tool_schemas = None
-        if tools:
-            tool_schemas = [
-                FunctionToolParam(
-                    name=tool.name,
-                    description=tool.description,
-                    parameters=tool.get_input_schema(),
-                    strict=True,
-                    type="function",
-                )
-                for tool in tools
-            ]
+        tool_schemas = self._cached_tool_schemas(tools, self._build_tool_schemas) if tools else None
 
+        system_messages, conversation = self._split_system_messages(msgs)
         if reuse_history:
-            self.message_history = self.message_history + msgs
+            request_messages = (system_messages or self._cache_anchor) + self._tail + conversation
         else:
-            self.message_history = msgs
+            request_messages = system_messages + conversation
 
-        # Apply retry decorator to the API call
-        retry_decorator = retry_with(
-            func=self._create_ollama_response,
-            provider_name="Ollama",
-            max_retries=model_config.max_retries,
-        )
-        response = retry_decorator(model_config, tool_schemas)
+        return tool_schemas, system_messages, conversation, request_messages
+
+    def _complete_chat(
+        self,
+        response: ChatResponse,
+        messages: list[LLMMessage],
+        system_messages: ResponseInputParam,
+        conversation: ResponseInputParam,
+        model_config: ModelConfig,
+        tools: list[Tool] | None,
+        reuse_history: bool,
+    ) -> LLMResponse:
+        """Record the new messages in the history, then convert the response and record it."""
+        if reuse_history:
+            # Earlier entries are never rewritten; new turns only extend the tail
+            if system_messages:
+                self._cache_anchor = system_messages
+            self._tail.extend(conversation)
+            self._commit_messages(messages)
+        else:
+            self._cache_anchor = system_messages
+            self._tail = conversation
+            self._commit_messages(messages, replace=True)
 
         content = ""
         tool_calls: list[ToolCall] = []
 
         if response.message.tool_calls:
             for tool in response.message.tool_calls:
+                tool_call_id = self._id_generator()
                 tool_calls.append(
                     ToolCall(
-                        call_id=self._id_generator(),
+                        call_id=tool_call_id,
                         name=tool.function.name,
                         arguments=dict(tool.function.arguments),
-                        id=self._id_generator(),
+                        id=tool_call_id,
                     )
                 )
         else:
@@ -149,29 +326,40 @@ class OllamaClient(BaseLLMClient):
         """
         openai_messages: ResponseInputParam = []
         for msg in messages:
-            if msg.tool_result:
-                openai_messages.append(self.parse_tool_call_result(msg.tool_result))
-            elif msg.tool_call:
-                openai_messages.append(self.parse_tool_call(msg.tool_call))
-            else:
-                if not msg.content:
-                    raise ValueError("Message content is required")
-                if msg.role == "system":
-                    openai_messages.append({"role": "system", "content": msg.content})
-                elif msg.role == "user":
-                    openai_messages.append({"role": "user", "content": msg.content})
-                elif msg.role == "assistant":
-                    openai_messages.append({"role": "assistant", "content": msg.content})
-                else:
-                    raise ValueError(f"Invalid message role: {msg.role}")
+            parser = self._MESSAGE_PARSERS.get(msg.kind)
+            if parser is None:
+                raise ValueError(f"Invalid message role: {msg.role}")
+            openai_messages.append(parser(self, msg))
         return openai_messages
 
+    def _parse_tool_result_message(self, msg: LLMMessage) -> FunctionCallOutput:
+        assert msg.tool_result is not None
+        return self.parse_tool_call_result(msg.tool_result)
+
+    def _parse_tool_call_message(self, msg: LLMMessage) -> ResponseFunctionToolCallParam:
+        assert msg.tool_call is not None
+        return self.parse_tool_call(msg.tool_call)
+
+    def _parse_text_message(self, msg: LLMMessage) -> Any:
+        if not msg.content:
+            raise ValueError("Message content is required")
+        return {"role": msg.role, "content": msg.content}
+
+    # Request entries by message kind; text messages keep their role
+    _MESSAGE_PARSERS: ClassVar[dict[str, Callable[["OllamaClient", LLMMessage], Any]]] = {
+        "tool_result": _parse_tool_result_message,
+        "tool_call": _parse_tool_call_message,
+        "system": _parse_text_message,
+        "user": _parse_text_message,
+        "assistant": _parse_text_message,
+    }
+
     def parse_tool_call(self, tool_call: ToolCall) -> ResponseFunctionToolCallParam:
         """Parse the tool call from the LLM response."""
         return ResponseFunctionToolCallParam(
             call_id=tool_call.call_id,
             name=tool_call.name,
-            arguments=json.dumps(tool_call.arguments),
+            arguments=_dumps_arguments(tool_call.arguments),
             type="function_call",
         )
 
@@ -193,4 +381,4 @@ class OllamaClient(BaseLLMClient):
 
     def _id_generator(self) -> str:
         """Generate a random ID string"""
-        return str(uuid.uuid4())
+        return secrets.token_hex(16)
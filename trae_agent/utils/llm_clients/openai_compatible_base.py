@@ -109,7 +109,7 @@ class OpenAICompatibleClient(BaseLLMClient):
         """Send chat messages with optional tool support."""
         parsed_messages = self.parse_messages(messages)
         if reuse_history:
-            self.message_history = self.message_history + parsed_messages
+            self.message_history.extend(parsed_messages)
         else:
             self.message_history = parsed_messages
 
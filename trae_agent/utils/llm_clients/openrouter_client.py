@@ -4,15 +4,38 @@
 """OpenRouter provider configuration."""
 
 import os
+import re
+from dataclasses import replace
+from functools import lru_cache
 
 import openai
 
 from trae_agent.utils.config import ModelConfig
+from trae_agent.utils.llm_clients._http import shared_http_client
 from trae_agent.utils.llm_clients.openai_compatible_base import (
     OpenAICompatibleClient,
     ProviderConfig,
 )
 
+# Most modern models on OpenRouter support tool calling
+# We'll be conservative and check for known capable models
+_TOOL_CAPABLE_PATTERNS = (
+    "gpt-4",
+    "gpt-3.5-turbo",
+    "claude-3",
+    "claude-2",
+    "gemini",
+    "mistral",
+    "llama-3",
+    "command-r",
+)
+_TOOL_CAPABLE_MODEL_RE = re.compile("|".join(map(re.escape, _TOOL_CAPABLE_PATTERNS)))
+
+
+@lru_cache(maxsize=128)
+def _model_supports_tool_calling(model_name: str) -> bool:
+    return _TOOL_CAPABLE_MODEL_RE.search(model_name.lower()) is not None
+
 
 class OpenRouterProvider(ProviderConfig):
     """OpenRouter provider configuration."""
@@ -21,7 +44,7 @@ class OpenRouterProvider(ProviderConfig):
         self, api_key: str, base_url: str | None, api_version: str | None
     ) -> openai.OpenAI:
         """Create OpenAI client with OpenRouter base URL."""
-        return openai.OpenAI(api_key=api_key, base_url=base_url)
+        return openai.OpenAI(api_key=api_key, base_url=base_url, http_client=shared_http_client())
 
     def get_service_name(self) -> str:
         """Get the service name for retry logging."""
@@ -47,19 +70,7 @@ class OpenRouterProvider(ProviderConfig):
 
     def supports_tool_calling(self, model_name: str) -> bool:
         """Check if the model supports tool calling."""
-        # Most modern models on OpenRouter support tool calling
-        # We'll be conservative and check for known capable models
-        tool_capable_patterns = [
-            "gpt-4",
-            "gpt-3.5-turbo",
-            "claude-3",
-            "claude-2",
-            "gemini",
-            "mistral",
-            "llama-3",
-            "command-r",
-        ]
-        return any(pattern in model_name.lower() for pattern in tool_capable_patterns)
+        return _model_supports_tool_calling(model_name)
 
 
 class OpenRouterClient(OpenAICompatibleClient):
@@ -70,5 +81,7 @@ class OpenRouterClient(OpenAICompatibleClient):
             model_config.model_provider.base_url is None
             or model_config.model_provider.base_url == ""
         ):
-            model_config.model_provider.base_url = "https://openrouter.ai/api/v1"
+            model_config.model_provider = replace(
+                model_config.model_provider, base_url="https://openrouter.ai/api/v1"
+            )
         super().__init__(model_config, OpenRouterProvider())
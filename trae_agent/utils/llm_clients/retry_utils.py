@@ -1,14 +1,104 @@
 # Copyright (c) 2025 ByteDance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import random
+import threading
 import time
 import traceback
-from functools import wraps
+from collections.abc import Awaitable
+from functools import cache, wraps
 from typing import Any, Callable, TypeVar
 
+from trae_agent.utils.llm_clients._limiter import http_status, retry_after_seconds
+
 T = TypeVar("T")
 
+# Rate limits, timeouts and server-side failures; other HTTP errors recur on every attempt
+_RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+BACKOFF_BASE_SECONDS = 3.0
+BACKOFF_CAP_SECONDS = 30.0
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a failed API call may succeed if it is repeated.
+
+    Errors with an HTTP status are retried only for transient statuses, so a bad request, a
+    rejected API key or an unknown model fails at once. Errors without one are mostly connection
+    failures and timeouts, which are retried.
+    """
+    status_code = http_status(exc)
+    if status_code is None or status_code < 100:
+        return True
+    return status_code in _RETRYABLE_STATUS_CODES
+
+
+def backoff_seconds(exc: BaseException, attempt: int) -> float:
+    """How long to wait before the next attempt, honouring a delay requested by the provider."""
+    delay = retry_after_seconds(exc)
+    if delay is not None:
+        return delay
+    return min(BACKOFF_BASE_SECONDS * 2**attempt, BACKOFF_CAP_SECONDS) + random.uniform(
+        0, BACKOFF_BASE_SECONDS
+    )
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose recent calls have kept failing."""
+
+
+class CircuitBreaker:
+    """Turns away new calls to a provider for a while after repeated transient failures.
+
+    Once the reset timeout has passed, a single trial call is let through. Its success closes
+    the circuit and its failure reopens it; a trial that never reports back is replaced by
+    another after the same timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self._failures: int = 0
+        self._opened_at: float | None = None
+        self._trial_started_at: float | None = None
+        # Shared by the worker threads of concurrent chats
+        self._lock: threading.Lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a new call may be made now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            if (
+                self._trial_started_at is not None
+                and now - self._trial_started_at < self.reset_timeout
+            ):
+                return False
+            self._trial_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold or self._trial_started_at is not None:
+                self._opened_at = time.monotonic()
+                self._trial_started_at = None
+
+
+@cache
+def get_circuit_breaker(provider_name: str) -> CircuitBreaker:
+    """Return the circuit breaker shared by all calls to this provider."""
+    return CircuitBreaker()
+
 
 def retry_with(
     func: Callable[..., T],
@@ -16,7 +106,10 @@ def retry_with(
     max_retries: int = 3,
 ) -> Callable[..., T]:
     """
-    Decorator that adds retry logic with randomized backoff.
+    Decorator that retries transient failures with exponential backoff.
+
+    Errors that would recur, such as a rejected request, are raised at once. New calls to a
+    provider whose circuit breaker is open fail fast with CircuitOpenError.
 
     Args:
         func: The function to decorate
@@ -30,24 +123,97 @@ def retry_with(
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> T:
         last_exception = None
+        circuit_breaker = get_circuit_breaker(provider_name)
+
+        # An open circuit turns away new calls; one already under way keeps its retries
+        if not circuit_breaker.allow():
+            raise CircuitOpenError(
+                f"{provider_name} API calls keep failing; not calling it for now"
+            )
 
         for attempt in range(max_retries + 1):
             try:
-                return func(*args, **kwargs)
+                result = func(*args, **kwargs)
             except Exception as e:
                 last_exception = e
+                if not is_retryable(e):
+                    # The provider answered, so it is reachable even though it refused the request
+                    circuit_breaker.record_success()
+                    raise
+                circuit_breaker.record_failure()
 
                 if attempt == max_retries:
                     # Last attempt, re-raise the exception
                     raise
 
-                sleep_time = random.randint(3, 30)
+                sleep_time = backoff_seconds(e, attempt)
                 this_error_message = str(e)
                 print(
-                    f"{provider_name} API call failed: {this_error_message}. Will sleep for {sleep_time} seconds and will retry.\n{traceback.format_exc()}"
+                    f"{provider_name} API call failed: {this_error_message}. Will sleep for {sleep_time:.1f} seconds and will retry.\n{traceback.format_exc()}"
                 )
-                # Randomly sleep for 3-30 seconds
                 time.sleep(sleep_time)
+            else:
+                circuit_breaker.record_success()
+                return result
+
+        # This should never be reached, but just in case
+        raise last_exception or Exception("Retry failed for unknown reason")
+
+    return wrapper
+
+
+def async_retry_with(
+    func: Callable[..., Awaitable[T]],
+    provider_name: str = "OpenAI",
+    max_retries: int = 3,
+) -> Callable[..., Awaitable[T]]:
+    """
+    Asynchronous counterpart of retry_with that waits without blocking the event loop.
+
+    Args:
+        func: The coroutine function to decorate
+        provider_name: The name of the model provider being called
+        max_retries: Maximum number of retry attempts
+
+    Returns:
+        Decorated coroutine function with retry logic
+    """
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        last_exception = None
+        circuit_breaker = get_circuit_breaker(provider_name)
+
+        # An open circuit turns away new calls; one already under way keeps its retries
+        if not circuit_breaker.allow():
+            raise CircuitOpenError(
+                f"{provider_name} API calls keep failing; not calling it for now"
+            )
+
+        for attempt in range(max_retries + 1):
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                last_exception = e
+                if not is_retryable(e):
+                    # The provider answered, so it is reachable even though it refused the request
+                    circuit_breaker.record_success()
+                    raise
+                circuit_breaker.record_failure()
+
+                if attempt == max_retries:
+                    # Last attempt, re-raise the exception
+                    raise
+
+                sleep_time = backoff_seconds(e, attempt)
+                this_error_message = str(e)
+                print(
+                    f"{provider_name} API call failed: {this_error_message}. Will sleep for {sleep_time:.1f} seconds and will retry.\n{traceback.format_exc()}"
+                )
+                await asyncio.sleep(sleep_time)
+            else:
+                circuit_breaker.record_success()
+                return result
 
         # This should never be reached, but just in case
         raise last_exception or Exception("Retry failed for unknown reason")
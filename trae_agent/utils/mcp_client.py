@@ -1,8 +1,12 @@
+import asyncio
+import time
 from contextlib import AsyncExitStack
 from enum import Enum
+from typing import Any
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import ServerNotification, ToolListChangedNotification
 
 from ..tools.mcp_tool import MCPTool
 from .config import MCPServerConfig
@@ -24,11 +28,19 @@ class MCPDiscoveryState(Enum):
 
 
 class MCPClient:
+    # How long a server's tool list is reused, unless the server reports a change first
+    TOOLS_CACHE_TTL_SECONDS: float = 60.0
+
     def __init__(self):
-        # Initialize session and client objects
-        self.session: ClientSession | None = None
+        # Initialize session and client objects, one session per connected server
+        self.sessions: dict[str, ClientSession] = {}
         self.exit_stack = AsyncExitStack()
         self.mcp_servers_status: dict[str, MCPServerStatus] = {}
+        # Tool lists by server name, with the time they were fetched
+        self._tools_cache: dict[str, tuple[float, Any]] = {}
+        # Tasks holding the servers opened by connect_all, and the event that lets them close
+        self._server_tasks: list[asyncio.Task[None]] = []
+        self._closing: asyncio.Event = asyncio.Event()
 
     def get_mcp_server_status(self, mcp_server_name: str) -> MCPServerStatus:
         return self.mcp_servers_status.get(mcp_server_name, MCPServerStatus.DISCONNECTED)
@@ -43,7 +55,88 @@ class MCPClient:
         mcp_tools_container: list,
         model_provider,
     ):
-        transport = None
+        transport = await self._open_transport(mcp_server_name, mcp_server_config)
+        await self.connect_to_server(mcp_server_name, transport)
+        for mcp_tool in await self._discover_tools(mcp_server_name, model_provider):
+            mcp_tools_container.append(mcp_tool)
+
+    async def connect_all(
+        self,
+        mcp_servers_config: dict[str, MCPServerConfig],
+        mcp_tools_container: list,
+        model_provider,
+    ) -> list[str]:
+        """Connect to several MCP servers concurrently and collect their tools.
+
+        Each server is run by a task of its own that holds its transport and session, so a
+        server that cannot be used is shut down at once without disturbing the others.
+        Returns the names of the servers that could not be used; their tools are left out.
+        """
+        loop = asyncio.get_running_loop()
+        discoveries: dict[str, asyncio.Future[list[MCPTool]]] = {}
+        for mcp_server_name, mcp_server_config in mcp_servers_config.items():
+            self.update_mcp_server_status(mcp_server_name, MCPServerStatus.CONNECTING)
+            discovered: asyncio.Future[list[MCPTool]] = loop.create_future()
+            self._server_tasks.append(
+                asyncio.create_task(
+                    self._run_server(mcp_server_name, mcp_server_config, model_provider, discovered)
+                )
+            )
+            discoveries[mcp_server_name] = discovered
+
+        failed: list[str] = []
+        for mcp_server_name, discovered in discoveries.items():
+            try:
+                mcp_tools_container.extend(await discovered)
+            except Exception:
+                failed.append(mcp_server_name)
+        return failed
+
+    async def _run_server(
+        self,
+        mcp_server_name: str,
+        mcp_server_config: MCPServerConfig,
+        model_provider,
+        discovered: "asyncio.Future[list[MCPTool]]",
+    ) -> None:
+        """Connect to one server, report its tools and keep it open until cleanup.
+
+        The transport and session are entered and exited in this task, as the MCP SDK requires.
+        """
+        try:
+            async with AsyncExitStack() as server_stack:
+                stdio, write = await server_stack.enter_async_context(
+                    self._transport(mcp_server_name, mcp_server_config)
+                )
+                session = await server_stack.enter_async_context(
+                    self._create_session(mcp_server_name, stdio, write)
+                )
+                await session.initialize()
+                self.sessions[mcp_server_name] = session
+                self.update_mcp_server_status(mcp_server_name, MCPServerStatus.CONNECTED)
+                discovered.set_result(await self._discover_tools(mcp_server_name, model_provider))
+                await self._closing.wait()
+        except Exception as e:
+            if not discovered.done():
+                discovered.set_exception(e)
+        finally:
+            if not discovered.done():
+                _ = discovered.cancel()
+            _ = self.sessions.pop(mcp_server_name, None)
+            _ = self._tools_cache.pop(mcp_server_name, None)
+            self.update_mcp_server_status(mcp_server_name, MCPServerStatus.DISCONNECTED)
+
+    def _create_session(self, mcp_server_name: str, stdio, write) -> ClientSession:
+        async def handle_message(message) -> None:
+            # Drop the cached tool list as soon as the server reports that it changed
+            if isinstance(message, ServerNotification) and isinstance(
+                message.root, ToolListChangedNotification
+            ):
+                _ = self._tools_cache.pop(mcp_server_name, None)
+
+        return ClientSession(stdio, write, message_handler=handle_message)
+
+    def _transport(self, mcp_server_name: str, mcp_server_config: MCPServerConfig):
         if mcp_server_config.http_url:
             raise NotImplementedError("HTTP transport is not implemented yet")
         elif mcp_server_config.url:
@@ -55,21 +148,22 @@ class MCPClient:
                 env=mcp_server_config.env,
                 cwd=mcp_server_config.cwd,
             )
-            transport = await self.exit_stack.enter_async_context(stdio_client(params))
+            return stdio_client(params)
         else:
             # error
             raise ValueError(
                 f"Invalid MCP server configuration for {mcp_server_name}. "
                 "Please provide either a command or a URL."
             )
-        try:
-            await self.connect_to_server(mcp_server_name, transport)
-            mcp_tools = await self.list_tools()
-            for tool in mcp_tools.tools:
-                mcp_tool = MCPTool(self, tool, model_provider)
-                mcp_tools_container.append(mcp_tool)
-        except Exception as e:
-            raise e
+
+    async def _open_transport(self, mcp_server_name: str, mcp_server_config: MCPServerConfig):
+        return await self.exit_stack.enter_async_context(
+            self._transport(mcp_server_name, mcp_server_config)
+        )
+
+    async def _discover_tools(self, mcp_server_name: str, model_provider) -> list[MCPTool]:
+        mcp_tools = await self.list_tools(mcp_server_name)
+        return [MCPTool(self, tool, model_provider, mcp_server_name) for tool in mcp_tools.tools]
 
     async def connect_to_server(self, mcp_server_name, transport):
         """Connect to an MCP server
@@ -81,24 +175,46 @@ class MCPClient:
             self.update_mcp_server_status(mcp_server_name, MCPServerStatus.CONNECTING)
             try:
                 stdio, write = transport
-                self.session = await self.exit_stack.enter_async_context(
-                    ClientSession(stdio, write)
+                session = await self.exit_stack.enter_async_context(
+                    self._create_session(mcp_server_name, stdio, write)
                 )
-                await self.session.initialize()
+                await session.initialize()
+                self.sessions[mcp_server_name] = session
                 self.update_mcp_server_status(mcp_server_name, MCPServerStatus.CONNECTED)
             except Exception as e:
                 self.update_mcp_server_status(mcp_server_name, MCPServerStatus.DISCONNECTED)
                 raise e
 
-    async def call_tool(self, name, args):
-        output = await self.session.call_tool(name, args)
+    def _resolve_server_name(self, mcp_server_name: str | None) -> str:
+        if mcp_server_name is not None:
+            return mcp_server_name
+        # A client connected to a single server may be used without naming it
+        if len(self.sessions) != 1:
+            raise ValueError("An MCP server name is required when several servers are connected")
+        return next(iter(self.sessions))
+
+    async def call_tool(self, name, args, mcp_server_name: str | None = None):
+        session = self.sessions[self._resolve_server_name(mcp_server_name)]
+        output = await session.call_tool(name, args)
         return output
 
-    async def list_tools(self):
-        tools = await self.session.list_tools()
+    async def list_tools(self, mcp_server_name: str | None = None):
+        mcp_server_name = self._resolve_server_name(mcp_server_name)
+        now = time.monotonic()
+        cached = self._tools_cache.get(mcp_server_name)
+        if cached is not None and now - cached[0] < self.TOOLS_CACHE_TTL_SECONDS:
+            return cached[1]
+        tools = await self.sessions[mcp_server_name].list_tools()
+        self._tools_cache[mcp_server_name] = (now, tools)
         return tools
 
-    async def cleanup(self, mcp_server_name):
-        """Clean up resources"""
+    async def cleanup(self, mcp_server_name: str | None = None):
+        """Clean up resources, marking the named server or, by default, every server disconnected"""
+        self._closing.set()
+        _ = await asyncio.gather(*self._server_tasks, return_exceptions=True)
+        self._server_tasks.clear()
+        self._closing = asyncio.Event()
         await self.exit_stack.aclose()
-        self.update_mcp_server_status(mcp_server_name, MCPServerStatus.DISCONNECTED)
+        self._tools_cache.clear()
+        for name in [mcp_server_name] if mcp_server_name else list(self.mcp_servers_status):
+            self.update_mcp_server_status(name, MCPServerStatus.DISCONNECTED)
@@ -8,7 +8,9 @@
 
 """Trajectory recording functionality for Trae Agent."""
 
+import asyncio
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -20,11 +22,12 @@ from trae_agent.utils.llm_clients.llm_basics import LLMMessage, LLMResponse
 class TrajectoryRecorder:
     """Records trajectory data for agent execution and LLM interactions."""
 
-    def __init__(self, trajectory_path: str | None = None):
+    def __init__(self, trajectory_path: str | None = None, flush_interval: float = 0.2):
         """Initialize trajectory recorder.
 
         Args:
             trajectory_path: Path to save trajectory file. If None, generates default path.
+            flush_interval: Seconds to coalesce updates for when recording inside an event loop.
         """
         if trajectory_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -51,6 +54,13 @@ class TrajectoryRecorder:
         }
         self._start_time: datetime | None = None
 
+        # Updates made inside a running event loop are coalesced and written off-loop
+        self._flush_interval: float = flush_interval
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._write_lock: threading.Lock = threading.Lock()
+        self._snapshot_seq: int = 0
+        self._written_seq: int = 0
+
     def start_recording(self, task: str, provider: str, model: str, max_steps: int) -> None:
         """Start recording a new trajectory.
 
@@ -72,7 +82,7 @@ class TrajectoryRecorder:
                 "agent_steps": [],
             }
         )
-        self.save_trajectory()
+        self._request_save()
 
     def record_llm_interaction(
         self,
@@ -125,7 +135,7 @@ class TrajectoryRecorder:
         }
 
         self.trajectory_data["llm_interactions"].append(interaction)
-        self.save_trajectory()
+        self._request_save()
 
     def record_agent_step(
         self,
@@ -186,14 +196,14 @@ class TrajectoryRecorder:
         }
 
         self.trajectory_data["agent_steps"].append(step_data)
-        self.save_trajectory()
+        self._request_save()
 
     def update_lakeview(self, step_number: int, lakeview_summary: str):
         for step_data in self.trajectory_data["agent_steps"]:
             if step_data["step_number"] == step_number:
                 step_data["lakeview_summary"] = lakeview_summary
                 break
-        self.save_trajectory()
+        self._request_save()
 
     def finalize_recording(self, success: bool, final_result: str | None = None) -> None:
         """Finalize the trajectory recording.
@@ -218,16 +228,64 @@ class TrajectoryRecorder:
         self.save_trajectory()
 
     def save_trajectory(self) -> None:
-        """Save the current trajectory data to file."""
+        """Save the current trajectory data to file, flushing any pending write."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            self._write_snapshot(*snapshot)
+
+    def flush(self) -> None:
+        """Write any update that is still waiting for its batched flush."""
+        if self._flush_handle is not None:
+            self.save_trajectory()
+
+    def _request_save(self) -> None:
+        """Save now, or batch with other updates when called from a running event loop."""
         try:
-            # Ensure directory exists
-            self.trajectory_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(self.trajectory_path, "w", encoding="utf-8") as f:
-                json.dump(self.trajectory_data, f, indent=2, ensure_ascii=False)
-
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_trajectory()
+            return
+
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._flush_interval, self._flush_pending, loop)
+
+    def _flush_pending(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Serialize on the loop thread and hand the file write to the default executor."""
+        self._flush_handle = None
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            _ = loop.run_in_executor(None, self._write_snapshot, *snapshot)
+
+    def _snapshot(self) -> tuple[int, str] | None:
+        """Serialize the trajectory data, tagging it with a monotonically increasing sequence."""
+        try:
+            payload = json.dumps(self.trajectory_data, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"Warning: Failed to save trajectory to {self.trajectory_path}: {e}")
+            return None
+
+        self._snapshot_seq += 1
+        return self._snapshot_seq, payload
+
+    def _write_snapshot(self, seq: int, payload: str) -> None:
+        """Write a serialized snapshot unless a newer one is already on disk."""
+        with self._write_lock:
+            if seq <= self._written_seq:
+                return
+            try:
+                # Ensure directory exists
+                self.trajectory_path.parent.mkdir(parents=True, exist_ok=True)
+
+                with open(self.trajectory_path, "w", encoding="utf-8") as f:
+                    _ = f.write(payload)
+                self._written_seq = seq
+
+            except Exception as e:
+                print(f"Warning: Failed to save trajectory to {self.trajectory_path}: {e}")
 
     def _serialize_message(self, message: LLMMessage) -> dict[str, Any]:
         """Serialize an LLM message to a dictionary."""